@@ -0,0 +1,294 @@
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from scoring import score_texts
+
+MIN_ABS_COMPOUND = 0.02
+TOP_COMMENTS = 15
+MOMENTUM_WINDOW = 3
+
+_US = timedelta(microseconds=1)
+
+
+def calculate_weighted_score(compound: float, recency_days: int = 0) -> float:
+    recency_weight = max(1, 7 - recency_days)
+    return compound * math.log(recency_weight + 1)
+
+
+def get_verdict(final_metric: float) -> str:
+    if final_metric > 0.2:
+        return "STRONG BUY"
+    elif final_metric > 0.05:
+        return "BUY"
+    elif final_metric < -0.2:
+        return "STRONG SELL"
+    elif final_metric < -0.05:
+        return "SELL"
+    else:
+        return "HOLD"
+
+
+def _seq_sum(values: np.ndarray) -> float:
+    # cumsum accumulates left to right like the builtin sum(); np.sum's pairwise
+    # summation would change the last bits of the rounded statistics.
+    return float(np.cumsum(values)[-1]) if len(values) else 0
+
+
+def _smallest(keys: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` smallest keys in stable-sort order, without a full sort."""
+    if len(keys) > k:
+        threshold = np.partition(keys, k - 1)[k - 1]
+        candidates = np.flatnonzero(keys <= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    return candidates[np.argsort(keys[candidates], kind='stable')][:k]
+
+
+def _largest_tail(keys: np.ndarray, k: int) -> np.ndarray:
+    """The last ``k`` indices of a stable ascending sort of ``keys``, without a full sort."""
+    if len(keys) > k:
+        threshold = np.partition(keys, len(keys) - k)[len(keys) - k]
+        candidates = np.flatnonzero(keys >= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    return candidates[np.argsort(keys[candidates], kind='stable')][-k:]
+
+
+def _to_naive(published, now: datetime) -> datetime:
+    if not isinstance(published, datetime):
+        return now
+    if published.tzinfo is not None:
+        return published.astimezone().replace(tzinfo=None)
+    return published
+
+
+def _label(compound: float) -> str:
+    return 'bullish' if compound > 0.05 else 'bearish' if compound < -0.05 else 'neutral'
+
+
+def _format_comment(title: str, compound: float, hours: float, days_old: float, source: str) -> Dict:
+    if hours < 1:
+        time_ago = f"{int(hours * 60)}m ago"
+    elif hours < 24:
+        time_ago = f"{int(hours)}h ago"
+    else:
+        time_ago = f"{int(days_old)}d ago"
+
+    return {
+        'text': title[:200],
+        'score': round(compound, 3),
+        'sentiment': _label(compound),
+        'source': source,
+        'time_ago': time_ago,
+        'hours_old': round(hours, 1)
+    }
+
+
+def _insufficient(stock_info: Dict, **extra) -> Dict:
+    return {
+        'verdict': 'INSUFFICIENT DATA',
+        'confidence_score': 0.0,
+        'stats': {'bullish': 0, 'bearish': 0, 'neutral': 0},
+        'top_comments': [],
+        'stock_info': stock_info,
+        **extra
+    }
+
+
+def build_analysis(all_articles: List[Dict], stock_info: Dict, now: Optional[datetime] = None) -> Dict:
+    """Score aggregation over columnar arrays of compound, weighted score, age and source."""
+    if not all_articles:
+        return _insufficient(stock_info)
+
+    now = now or datetime.now()
+    if all('compound' in article for article in all_articles):
+        compound = np.fromiter((a['compound'] for a in all_articles), dtype=np.float64, count=len(all_articles))
+    else:
+        compound = score_texts([f"{a['title']} {a['summary']}" for a in all_articles])
+
+    keep = np.flatnonzero(np.abs(compound) >= MIN_ABS_COMPOUND)
+    if not len(keep):
+        return _insufficient(stock_info, advanced_stats={})
+    articles = [all_articles[i] for i in keep.tolist()]
+    compound = compound[keep]
+    n = len(articles)
+
+    # integer microseconds / 1e6 matches timedelta.total_seconds() exactly
+    try:
+        age_us = np.fromiter([(now - a.get('published', now)) // _US for a in articles], dtype=np.int64, count=n)
+    except TypeError:
+        age_us = np.fromiter([(now - _to_naive(a.get('published'), now)) // _US for a in articles], dtype=np.int64, count=n)
+    hours_old = age_us / 1e6 / 3600
+    days_old = hours_old / 24
+
+    recency_days = np.minimum(np.trunc(days_old), 7).astype(np.int64)
+    recency_weight = np.maximum(1, 7 - recency_days)
+    weights, inverse = np.unique(recency_weight, return_inverse=True)
+    log_weight = np.array([math.log(w + 1) for w in weights.tolist()])[inverse]
+    weighted = compound * log_weight
+
+    source_codes: Dict[str, int] = {}
+    source_code = np.fromiter(
+        [source_codes.setdefault(a['source'], len(source_codes)) for a in articles], dtype=np.int64, count=n
+    )
+    source_names = list(source_codes)
+
+    bullish = compound > 0.05
+    bearish = compound < -0.05
+    bullish_count = int(bullish.sum())
+    bearish_count = int(bearish.sum())
+    neutral_count = n - bullish_count - bearish_count
+
+    final_metric = _seq_sum(weighted) / n
+    verdict = get_verdict(final_metric)
+
+    avg_sentiment = _seq_sum(compound) / n
+    variance = _seq_sum((compound - avg_sentiment) ** 2) / n
+    std_dev = math.sqrt(variance)
+
+    in_24h = hours_old <= 24
+    in_7d = days_old <= 7
+    articles_24h = int(in_24h.sum())
+    articles_7d = int(in_7d.sum())
+    sentiment_24h = _seq_sum(compound[in_24h]) / articles_24h if articles_24h else 0
+    sentiment_7d = _seq_sum(compound[in_7d]) / articles_7d if articles_7d else 0
+
+    if n >= MOMENTUM_WINDOW:
+        recent_avg = _seq_sum(compound[_smallest(hours_old, MOMENTUM_WINDOW)]) / MOMENTUM_WINDOW
+        older_avg = _seq_sum(compound[_largest_tail(hours_old, MOMENTUM_WINDOW)]) / MOMENTUM_WINDOW
+        momentum = recent_avg - older_avg
+    else:
+        momentum = 0
+
+    top_comments = [
+        _format_comment(articles[i]['title'], float(compound[i]), float(hours_old[i]), float(days_old[i]),
+                        source_names[source_code[i]])
+        for i in _smallest(-np.abs(weighted), TOP_COMMENTS).tolist()
+    ]
+
+    confidence_score = min(abs(final_metric) * 100, 100)
+
+    advanced_stats = {
+        'avg_sentiment': round(avg_sentiment, 4),
+        'volatility': round(std_dev, 4),
+        'momentum': round(momentum, 4),
+        'sentiment_24h': round(sentiment_24h, 4),
+        'sentiment_7d': round(sentiment_7d, 4),
+        'articles_24h': articles_24h,
+        'articles_7d': articles_7d,
+        'bullish_ratio': round(bullish_count / n, 3),
+        'bearish_ratio': round(bearish_count / n, 3),
+        'consensus_strength': round(max(bullish_count, bearish_count) / n, 3)
+    }
+
+    return {
+        'verdict': verdict,
+        'confidence_score': round(confidence_score, 2),
+        'stats': {
+            'bullish': bullish_count,
+            'bearish': bearish_count,
+            'neutral': neutral_count
+        },
+        'top_comments': top_comments,
+        'stock_info': stock_info,
+        'advanced_stats': advanced_stats
+    }
+
+
+class IncrementalAggregator:
+    """Running version of ``build_analysis`` for streaming partial results.
+
+    ``add`` folds in a batch of scored articles in O(batch) time: sums and counts
+    are kept running, variance uses Welford's update, and only the current top
+    comments and momentum endpoints are retained. ``snapshot`` renders the same
+    shape as ``build_analysis``.
+    """
+
+    def __init__(self, stock_info: Dict, now: Optional[datetime] = None):
+        self.stock_info = stock_info
+        self.now = now or datetime.now()
+        self.n = 0
+        self.seq = 0
+        self.weighted_sum = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.bullish = 0
+        self.bearish = 0
+        self.sum_24h = 0.0
+        self.count_24h = 0
+        self.sum_7d = 0.0
+        self.count_7d = 0
+        self.top: List[tuple] = []
+        self.newest: List[tuple] = []
+        self.oldest: List[tuple] = []
+
+    def add(self, articles: List[Dict]) -> None:
+        batch = []
+        for article in articles:
+            compound = article['compound']
+            if abs(compound) < MIN_ABS_COMPOUND:
+                continue
+            published = _to_naive(article.get('published'), self.now)
+            hours_old = ((self.now - published) // _US) / 1e6 / 3600
+            days_old = hours_old / 24
+            weighted = calculate_weighted_score(compound, min(int(days_old), 7))
+
+            self.n += 1
+            self.seq += 1
+            self.weighted_sum += weighted
+            delta = compound - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (compound - self.mean)
+            if compound > 0.05:
+                self.bullish += 1
+            elif compound < -0.05:
+                self.bearish += 1
+            if hours_old <= 24:
+                self.sum_24h += compound
+                self.count_24h += 1
+            if days_old <= 7:
+                self.sum_7d += compound
+                self.count_7d += 1
+            batch.append((self.seq, article, compound, weighted, hours_old, days_old))
+
+        self.top = sorted(self.top + batch, key=lambda x: (-abs(x[3]), x[0]))[:TOP_COMMENTS]
+        self.newest = sorted(self.newest + batch, key=lambda x: (x[4], x[0]))[:MOMENTUM_WINDOW]
+        self.oldest = sorted(self.oldest + batch, key=lambda x: (x[4], x[0]))[-MOMENTUM_WINDOW:]
+
+    def snapshot(self) -> Dict:
+        if not self.n:
+            return _insufficient(self.stock_info, advanced_stats={})
+
+        n = self.n
+        final_metric = self.weighted_sum / n
+        neutral = n - self.bullish - self.bearish
+        if n >= MOMENTUM_WINDOW:
+            momentum = (sum(x[2] for x in self.newest) - sum(x[2] for x in self.oldest)) / MOMENTUM_WINDOW
+        else:
+            momentum = 0
+
+        return {
+            'verdict': get_verdict(final_metric),
+            'confidence_score': round(min(abs(final_metric) * 100, 100), 2),
+            'stats': {'bullish': self.bullish, 'bearish': self.bearish, 'neutral': neutral},
+            'top_comments': [
+                _format_comment(article['title'], compound, hours, days, article['source'])
+                for _, article, compound, _, hours, days in self.top
+            ],
+            'stock_info': self.stock_info,
+            'advanced_stats': {
+                'avg_sentiment': round(self.mean, 4),
+                'volatility': round(math.sqrt(self.m2 / n), 4),
+                'momentum': round(momentum, 4),
+                'sentiment_24h': round(self.sum_24h / self.count_24h, 4) if self.count_24h else 0,
+                'sentiment_7d': round(self.sum_7d / self.count_7d, 4) if self.count_7d else 0,
+                'articles_24h': self.count_24h,
+                'articles_7d': self.count_7d,
+                'bullish_ratio': round(self.bullish / n, 3),
+                'bearish_ratio': round(self.bearish / n, 3),
+                'consensus_strength': round(max(self.bullish, self.bearish) / n, 3)
+            }
+        }
@@ -0,0 +1,150 @@
+"""Speed of the columnar ``build_analysis`` against the original per-dict passes.
+
+Also checks that both produce byte-identical JSON for the same inputs.
+Run from ``backend/``: ``python benchmarks/bench_aggregation.py``.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregation import build_analysis, calculate_weighted_score, get_verdict
+from benchmarks.stub_feeds import HEADLINES
+
+SOURCES = ['Google News', 'Bing News', 'Yahoo Finance', 'Finnhub', 'Marketaux', 'Seeking Alpha', 'Alpha Vantage']
+
+
+def reference_analysis(all_articles, stock_info, now):
+    """The pre-columnar aggregation, with ``datetime.now()`` pinned to ``now``."""
+    analyzed_data = []
+    for article in all_articles:
+        compound = article['compound']
+        if abs(compound) < 0.02:
+            continue
+        pub_date = article.get('published', now)
+        hours_old = (now - pub_date).total_seconds() / 3600
+        days_old = hours_old / 24
+        recency_days = min(int(days_old), 7)
+        weighted_score = calculate_weighted_score(compound, recency_days)
+        analyzed_data.append({
+            'text': article['title'][:200],
+            'compound': compound,
+            'weighted_score': weighted_score,
+            'source': article['source'],
+            'sentiment_type': 'bullish' if compound > 0.05 else 'bearish' if compound < -0.05 else 'neutral',
+            'published': pub_date,
+            'hours_old': hours_old,
+            'days_old': days_old
+        })
+
+    final_metric = sum(item['weighted_score'] for item in analyzed_data) / len(analyzed_data)
+    verdict = get_verdict(final_metric)
+    bullish_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'bullish')
+    bearish_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'bearish')
+    neutral_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'neutral')
+    sentiments = [item['compound'] for item in analyzed_data]
+    avg_sentiment = sum(sentiments) / len(sentiments)
+    variance = sum((x - avg_sentiment) ** 2 for x in sentiments) / len(sentiments)
+    std_dev = math.sqrt(variance)
+    recent_24h = [item for item in analyzed_data if item['hours_old'] <= 24]
+    recent_7d = [item for item in analyzed_data if item['days_old'] <= 7]
+    sentiment_24h = sum(item['compound'] for item in recent_24h) / len(recent_24h) if recent_24h else 0
+    sentiment_7d = sum(item['compound'] for item in recent_7d) / len(recent_7d) if recent_7d else 0
+    sorted_by_time = sorted(analyzed_data, key=lambda x: x['hours_old'])
+    if len(sorted_by_time) >= 3:
+        recent_avg = sum(item['compound'] for item in sorted_by_time[:3]) / 3
+        older_avg = sum(item['compound'] for item in sorted_by_time[-3:]) / 3
+        momentum = recent_avg - older_avg
+    else:
+        momentum = 0
+    sorted_articles = sorted(analyzed_data, key=lambda x: abs(x['weighted_score']), reverse=True)[:15]
+    top_comments = []
+    for item in sorted_articles:
+        hours = item['hours_old']
+        if hours < 1:
+            time_ago = f"{int(hours * 60)}m ago"
+        elif hours < 24:
+            time_ago = f"{int(hours)}h ago"
+        else:
+            time_ago = f"{int(item['days_old'])}d ago"
+        top_comments.append({
+            'text': item['text'],
+            'score': round(item['compound'], 3),
+            'sentiment': item['sentiment_type'],
+            'source': item['source'],
+            'time_ago': time_ago,
+            'hours_old': round(hours, 1)
+        })
+    confidence_score = min(abs(final_metric) * 100, 100)
+    advanced_stats = {
+        'avg_sentiment': round(avg_sentiment, 4),
+        'volatility': round(std_dev, 4),
+        'momentum': round(momentum, 4),
+        'sentiment_24h': round(sentiment_24h, 4),
+        'sentiment_7d': round(sentiment_7d, 4),
+        'articles_24h': len(recent_24h),
+        'articles_7d': len(recent_7d),
+        'bullish_ratio': round(bullish_count / len(analyzed_data), 3),
+        'bearish_ratio': round(bearish_count / len(analyzed_data), 3),
+        'consensus_strength': round(max(bullish_count, bearish_count) / len(analyzed_data), 3)
+    }
+    return {
+        'verdict': verdict,
+        'confidence_score': round(confidence_score, 2),
+        'stats': {'bullish': bullish_count, 'bearish': bearish_count, 'neutral': neutral_count},
+        'top_comments': top_comments,
+        'stock_info': stock_info,
+        'advanced_stats': advanced_stats
+    }
+
+
+def make_articles(count: int, now: datetime, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        # coarse timestamps and rounded scores force plenty of ties in the sorts
+        published = now - timedelta(minutes=rng.randint(-30, 14 * 24 * 60))
+        articles.append({
+            'title': rng.choice(HEADLINES).format(t="ACME") + f" {i}",
+            'summary': '',
+            'source': rng.choice(SOURCES),
+            'published': published,
+            'compound': round(rng.uniform(-1, 1), 2)
+        })
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    stock_info = {'name': 'ACME', 'sector': 'Unknown', 'current_price': 0}
+    print(f"{'articles':>9} {'reference ms':>13} {'columnar ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        articles = make_articles(size, now, seed=size)
+        timings = {}
+        outputs = {}
+        for name, fn in (('reference', reference_analysis), ('columnar', build_analysis)):
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                outputs[name] = fn(articles, stock_info, now)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        assert json.dumps(outputs['reference']) == json.dumps(outputs['columnar']), f"output differs at {size} articles"
+        print(f"{size:>9} {timings['reference'] * 1000:>13.1f} {timings['columnar'] * 1000:>12.1f} "
+              f"{timings['reference'] / timings['columnar']:>7.1f}x")
+    print("parity: byte-identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Wall-clock time of ``analyze_tickers_async`` as the watchlist grows.
+
+Compares one batch call with the equivalent sequence of single-ticker calls. Batch
+traffic is rate limited per source, so the batch is timed twice: with the limiter
+off, which shows what batching itself costs, and at ``SOURCE_RATE_LIMIT``, where
+large watchlists are bound by the limit (each ticker takes one token per news
+source) rather than by batching.
+Run from ``backend/``: ``python benchmarks/bench_batch.py``.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import config
+import http_client
+import service
+from benchmarks.stub_feeds import stub_transport
+from ratelimit import SourceRateLimiter
+
+
+async def _batch(tickers, rate: float) -> float:
+    # a fresh in-process limiter, so runs neither share nor persist bucket state
+    service.source_limiter = SourceRateLimiter(rate, config.SOURCE_RATE_BURST)
+    start = time.perf_counter()
+    async for _ in service.analyze_tickers_async(tickers):
+        pass
+    return time.perf_counter() - start
+
+
+async def _sequential(tickers) -> float:
+    start = time.perf_counter()
+    for ticker in tickers:
+        await service.analyze_ticker_async(ticker)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated upstream latency in seconds")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    args = parser.parse_args()
+
+    http_client.set_transport(stub_transport(latency=args.latency))
+    print(f"{'tickers':>8} {'sequential s':>13} {'batch s':>8} {'ms/ticker':>10}   "
+          f"{'throttled s':>11} {'ms/ticker':>10}")
+    for size in args.sizes:
+        tickers = [f"T{i:04d}" for i in range(size)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            sequential = asyncio.run(_sequential(tickers[:10])) * size / min(size, 10)
+            batch = asyncio.run(_batch(tickers, 0))
+            throttled = asyncio.run(_batch([f"R{ticker}" for ticker in tickers], config.SOURCE_RATE_LIMIT))
+        print(f"{size:>8} {sequential:>12.2f}* {batch:>8.2f} {batch / size * 1000:>10.1f}   "
+              f"{throttled:>11.2f} {throttled / size * 1000:>10.1f}")
+    print("* extrapolated from the first 10 tickers")
+    print(f"throttled: SOURCE_RATE_LIMIT={config.SOURCE_RATE_LIMIT:g}/s, burst {config.SOURCE_RATE_BURST:g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Requests/sec for /analyze-style callers against local stub feeds.
+
+"blocking" calls the sync ``analyze_ticker`` from inside the event loop, which is how
+``main.analyze_stock`` behaved before the async pipeline; "async" awaits
+``analyze_ticker_async``. Run from ``backend/``: ``python benchmarks/bench_concurrency.py``.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import http_client
+import service
+from benchmarks.stub_feeds import stub_transport
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "GOOGL", "META", "AMD"]
+
+
+async def _run(mode: str, concurrency: int, rounds: int) -> float:
+    async def caller(i: int):
+        for r in range(rounds):
+            ticker = TICKERS[(i + r) % len(TICKERS)]
+            if mode == "blocking":
+                service.analyze_ticker(ticker)
+            else:
+                await service.analyze_ticker_async(ticker)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await http_client.close_client()
+    return concurrency * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated upstream latency in seconds")
+    parser.add_argument("--rounds", type=int, default=2, help="requests per caller")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    http_client.set_transport(stub_transport(latency=args.latency))
+    print(f"{'callers':>8} {'blocking req/s':>15} {'async req/s':>12}")
+    for concurrency in args.concurrency:
+        # blocking callers serialize, so keep their total work bounded
+        with contextlib.redirect_stdout(io.StringIO()):
+            blocking = asyncio.run(_run("blocking", concurrency, 1))
+            native = asyncio.run(_run("async", concurrency, args.rounds))
+        print(f"{concurrency:>8} {blocking:>15.1f} {native:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
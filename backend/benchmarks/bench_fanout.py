@@ -0,0 +1,81 @@
+"""Tail latency of ``analyze_ticker_async`` when sources occasionally stall.
+
+"wait-all" waits for every source up to the fixed 6 s timeout, as the fan-out did
+before deadlines and quorum. "adaptive" uses the configured deadline, quorum and
+per-source timeouts learned from latency percentiles; both modes first run a
+warm-up so the adaptive timeouts have samples. Every news host stalls on a share
+of its requests (``--stall-rate``, ``--stall``).
+Run from ``backend/``: ``python benchmarks/bench_fanout.py``.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import http_client
+import service
+from benchmarks.stub_feeds import stub_transport
+from fanout import FanOutPolicy
+
+NEWS_HOSTS = ["news.google.com", "www.bing.com", "finance.yahoo.com", "finnhub.io",
+              "api.marketaux.com", "seekingalpha.com", "www.alphavantage.co"]
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(prefix: str, requests: int, concurrency: int, policy: FanOutPolicy) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, included = [], []
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await service.analyze_ticker_async(f"{prefix}{i:04d}", policy=policy)
+            latencies.append(time.perf_counter() - start)
+            included.append(len(result['sources']['included']))
+
+    await asyncio.gather(*(call(i) for i in range(requests)))
+    await http_client.close_client()
+    return latencies, included
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="base upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--stall-rate", type=float, default=0.02, help="share of requests per host that stall")
+    parser.add_argument("--stall", type=float, default=3.0, help="extra seconds a stalled request takes")
+    args = parser.parse_args()
+
+    http_client.set_transport(stub_transport(latency=args.latency, jitter=args.jitter,
+                                             tail={host: (args.stall_rate, args.stall) for host in NEWS_HOSTS}))
+    learned_min_samples = service.source_deadlines.min_samples
+    modes = (("wait-all", FanOutPolicy(), 10 ** 9), ("adaptive", service.REQUEST_POLICY, learned_min_samples))
+
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'sources':>8} {'all 7':>6}")
+    for label, policy, min_samples in modes:
+        service.source_deadlines.min_samples = min_samples
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(run(f"W{label[0]}", args.warmup, args.concurrency, policy))
+            latencies, included = asyncio.run(run(label[0].upper(), args.requests, args.concurrency, policy))
+        complete = sum(1 for n in included if n == len(NEWS_HOSTS)) / len(included)
+        print(f"{label:<10} {percentile(latencies, 0.5) * 1000:>8.0f} {percentile(latencies, 0.95) * 1000:>8.0f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.0f} {max(latencies) * 1000:>8.0f} "
+              f"{statistics.mean(included):>8.2f} {complete:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
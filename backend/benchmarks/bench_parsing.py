@@ -0,0 +1,143 @@
+"""Per-call CPU time and peak memory of the streaming parsers against the BeautifulSoup/feedparser path.
+
+Parity is checked on every recorded Yahoo and RSS fixture and on the samples in
+``benchmarks/parity``: pages in the real sites' formats with the markup the stub
+fixtures lack (nested headings, scripts in summaries, escaped HTML descriptions,
+``content:encoded`` bodies, inline markup that takes the feedparser fallback).
+Timings cover the fixtures and full-size pages (a Yahoo page padded with markup and
+script, a 100-item feed), fed to the streaming parsers in network-sized chunks.
+
+Run from ``backend/``: ``python benchmarks/bench_parsing.py``.
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from parsing import FeedParser, HeadingParser
+
+FEED_HOSTS = {"news.google.com": 15, "www.bing.com": 10, "seekingalpha.com": 10}
+PARITY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parity")
+CHUNK = 16384
+
+
+def reference_yahoo(body: bytes) -> list:
+    """The original ``_parse_yahoo_news`` extraction."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(body, 'html.parser')
+    return [item.get_text(strip=True) for item in soup.find_all('h3', limit=15)]
+
+
+def reference_feed(body: bytes, limit: int) -> list:
+    """The original ``_feed_parser`` extraction."""
+    import feedparser
+
+    feed = feedparser.parse(body)
+    entries = []
+    for entry in feed.entries[:limit]:
+        published = entry.get('published_parsed', None)
+        entries.append({
+            'title': entry.title,
+            'summary': entry.get('summary', ''),
+            'published': datetime(*published[:6]) if published else None,
+        })
+    return entries
+
+
+def stream(parser, body: bytes):
+    for i in range(0, len(body), CHUNK):
+        if parser.feed_bytes(body[i:i + CHUNK]):
+            break
+    return parser.finish()
+
+
+def load_fixtures(fixture_dir: str) -> dict:
+    bodies = {}
+    for name in sorted(os.listdir(fixture_dir)):
+        host = name.split("__", 1)[0]
+        if name.endswith(".json") and (host == "finance.yahoo.com" or host in FEED_HOSTS):
+            with open(os.path.join(fixture_dir, name)) as f:
+                bodies.setdefault(host, []).append(base64.b64decode(json.load(f)["body"]))
+    return bodies
+
+
+def load_samples(sample_dir: str) -> dict:
+    """Raw bodies named ``<host>__<anything>``, as saved from a browser or curl."""
+    bodies = {}
+    for name in sorted(os.listdir(sample_dir)):
+        with open(os.path.join(sample_dir, name), "rb") as f:
+            bodies.setdefault(name.split("__", 1)[0], []).append(f.read())
+    return bodies
+
+
+def full_size_yahoo(body: bytes) -> bytes:
+    head = b"<html><head><script>" + b"var config = {};" * 20000 + b"</script></head><body>"
+    filler = b"<div class='story'><span>related</span><p>filler text and more filler</p></div>" * 8000
+    return head + body.replace(b"<html><body>", b"").replace(b"</body></html>", b"") + filler + b"</body></html>"
+
+
+def full_size_feed(body: bytes) -> bytes:
+    start, end = body.index(b"<item>"), body.rindex(b"</item>") + len(b"</item>")
+    items = body[start:end]
+    return body[:start] + items * max(1, 100 // items.count(b"<item>")) + body[end:]
+
+
+def measure(fn, repeat: int) -> tuple:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    cpu = (time.process_time() - start) / repeat
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def report(label: str, reference, streaming, repeat: int) -> None:
+    ref_cpu, ref_peak = measure(reference, repeat)
+    new_cpu, new_peak = measure(streaming, repeat)
+    print(f"{label:<34} cpu {ref_cpu * 1000:>8.2f} -> {new_cpu * 1000:>7.2f} ms"
+          f"   peak {ref_peak / 1024:>8.0f} -> {new_peak / 1024:>6.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=config.FIXTURE_DIR)
+    parser.add_argument("--samples", default=PARITY_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bodies = load_fixtures(args.fixtures)
+    samples = load_samples(args.samples)
+    checked = 0
+    for host in bodies.keys() | samples.keys():
+        for body in bodies.get(host, []) + samples.get(host, []):
+            if host == "finance.yahoo.com":
+                assert stream(HeadingParser('h3', 15), body) == reference_yahoo(body), f"{host} headings diverged"
+            else:
+                limit = FEED_HOSTS[host]
+                assert stream(FeedParser(limit), body) == reference_feed(body, limit), f"{host} entries diverged"
+            checked += 1
+    print(f"parity: OK ({checked} fixtures)")
+
+    yahoo = bodies["finance.yahoo.com"][0]
+    feed = bodies["news.google.com"][0]
+    for label, page in (("yahoo fixture", yahoo), ("yahoo full-size page", full_size_yahoo(yahoo))):
+        report(f"{label} ({len(page) // 1024} KiB)", lambda: reference_yahoo(page),
+               lambda: stream(HeadingParser('h3', 15), page), args.repeat)
+    for label, page in (("rss fixture", feed), ("rss 100-item feed", full_size_feed(feed))):
+        report(f"{label} ({len(page) // 1024} KiB)", lambda: reference_feed(page, 15),
+               lambda: stream(FeedParser(15), page), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
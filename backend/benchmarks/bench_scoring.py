@@ -0,0 +1,109 @@
+"""Articles/sec for sentiment scoring, with a parity check against the per-text path.
+
+Also compares the VADER and finance engines: raw per-article throughput, and how many
+finance headlines each one scores below the aggregation cutoff (and so discards).
+
+Run from ``backend/``: ``python benchmarks/bench_scoring.py``.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lexicon
+import scoring
+from aggregation import MIN_ABS_COMPOUND
+from benchmarks.stub_feeds import HEADLINES
+
+FINANCE_HEADLINES = [
+    "{t} beats estimates, raises guidance",
+    "Analyst downgrades {t} to underweight",
+    "{t} guidance cut as demand softens",
+    "{t} misses expectations on revenue",
+    "Morgan Stanley upgrades ${t}, price target raised to $250",
+    "{t} plunges after profit warning",
+    "{t} stock soars to all-time high",
+    "{t} tumbles as short seller report alleges accounting issues",
+    "{t} (NYSE: {t}) announces dividend hike and new buyback",
+    "{t} slumps on weak outlook, price target cut",
+]
+
+
+def reference_score(analyzer, text: str) -> float:
+    """The original per-article ``analyze_sentiment`` implementation, minus the lexicon load."""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^\w\s.,!?-]', '', text).strip()
+    if not text:
+        return 0.0
+    return analyzer.polarity_scores(text)['compound']
+
+
+def make_texts(count: int, unique: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    tickers = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+    pool = [
+        f"{rng.choice(HEADLINES).format(t=rng.choice(tickers))} #{i} see https://example.com/{i} :) "
+        + " ".join(rng.choice(HEADLINES).format(t="it").split()[:rng.randint(3, 9)])
+        for i in range(unique)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def rate(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<32} {count / seconds:>12,.0f} articles/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--unique", type=int, default=8000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    tables = lexicon.get_tables()
+    vader = scoring.VaderEngine.from_tables(*tables)
+    finance = scoring.FinanceEngine.from_tables(*tables)
+    texts = make_texts(args.count, args.unique)
+
+    start = time.perf_counter()
+    baseline = [reference_score(vader.analyzer, text) for text in texts]
+    rate("per-article loop (original)", len(texts), time.perf_counter() - start)
+    for engine in (vader, finance):
+        start = time.perf_counter()
+        scores = [engine.score(text) for text in texts]
+        rate(f"per-article loop ({type(engine).__name__})", len(texts), time.perf_counter() - start)
+        if engine is vader:
+            assert scores == baseline, "VaderEngine diverged from the original implementation"
+
+    samples = [(h.format(t=t), t) for h in FINANCE_HEADLINES for t in ("AAPL", "LOW", "FUN")]
+    for engine in (vader, finance):
+        dropped = sum(abs(engine.score(text, engine.masked_symbol(t))) < MIN_ABS_COMPOUND for text, t in samples)
+        print(f"{type(engine).__name__:<32} {dropped:>5}/{len(samples)} finance headlines below cutoff")
+
+    expected = [scoring.get_engine().score(text) for text in texts]
+
+    scoring._memo.clear()
+    start = time.perf_counter()
+    scores = scoring.score_texts(texts)
+    rate("score_texts (cold memo)", len(texts), time.perf_counter() - start)
+    assert scores.tolist() == expected, "score_texts diverged from per-text scores"
+
+    start = time.perf_counter()
+    scoring.score_texts(texts)
+    rate("score_texts (warm memo)", len(texts), time.perf_counter() - start)
+
+    scoring._memo.clear()
+    start = time.perf_counter()
+    pooled = scoring.score_texts(texts, processes=args.processes)
+    rate(f"score_texts ({args.processes} processes)", len(texts), time.perf_counter() - start)
+    assert pooled.tolist() == expected, "process-pool scores diverged from per-text scores"
+
+    print("parity: OK")
+
+
+if __name__ == "__main__":
+    main()
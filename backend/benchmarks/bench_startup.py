@@ -0,0 +1,71 @@
+"""Cold-start cost of the API: import time, time to first response and first-score latency.
+
+Every sample is a fresh interpreter. "first response" is measured from process spawn
+to the first ``GET /`` answered through the app's lifespan; "first score" is the first
+``analyze_sentiment`` call, which loads the VADER lexicon either from its text files or
+from the compiled lexicon file. Run from ``backend/``: ``python benchmarks/bench_startup.py``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, os, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+import httpx
+
+async def first_response():
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/")).raise_for_status()
+        return time.time()
+
+responded = asyncio.run(first_response())
+import service
+scoring_started = time.perf_counter()
+service.analyze_sentiment("Shares rally after strong quarterly results")
+print(json.dumps({
+    "import_main_ms": (imported - started) * 1000,
+    "first_response_ms": (responded - float(os.environ["BENCH_SPAWNED_AT"])) * 1000,
+    "first_score_ms": (time.perf_counter() - scoring_started) * 1000,
+}))
+"""
+
+
+def sample(lexicon_cache: str) -> dict:
+    env = dict(os.environ, ARTICLE_DB_PATH=":memory:", WARMUP_ON_STARTUP="0", LEXICON_CACHE_PATH=lexicon_cache,
+               BENCH_SPAWNED_AT=repr(time.time()))
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def report(label: str, samples: list) -> None:
+    for key in samples[0]:
+        values = [s[key] for s in samples]
+        print(f"{label:<16} {key:<20} median {statistics.median(values):>8.1f} ms   min {min(values):>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "lexicon.bin")
+        sample(cache_path)  # writes the lexicon cache
+        report("text lexicon", [sample("") for _ in range(args.runs)])
+        report("compiled lexicon", [sample(cache_path) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
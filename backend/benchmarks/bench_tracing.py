@@ -0,0 +1,89 @@
+"""Overhead of request tracing: untraced, traced, and traced with the sampling profiler.
+
+``analyze_ticker_async`` runs against the replayed fixtures with no injected latency,
+so the CPU cost of the spans and of the sampler is not hidden behind network waits.
+Also reports the per-call cost of ``span()`` with and without an active trace.
+Run from ``backend/``: ``python benchmarks/bench_tracing.py``.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import config
+import http_client
+import tracing
+from replay import ReplayTransport
+from service import analyze_ticker_async
+
+MODES = (("untraced", False, False), ("traced", True, False), ("traced+profile", True, True))
+
+
+def span_cost(calls: int) -> tuple:
+    def loop() -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            with tracing.span("stage"):
+                pass
+        return (time.perf_counter() - start) / calls
+
+    disabled = loop()
+    trace = tracing.start("bench", force=True)
+    enabled = loop()
+    tracing.finish(trace)
+    return disabled, enabled
+
+
+async def analyze(ticker: str, traced: bool) -> float:
+    start = time.perf_counter()
+    trace = tracing.start(f"/analyze/{ticker}", force=True) if traced else None
+    try:
+        await analyze_ticker_async(ticker)
+    finally:
+        tracing.finish(trace)
+    return time.perf_counter() - start
+
+
+async def run(runs: int, prefix: str) -> dict:
+    samples = {label: [] for label, _, _ in MODES}
+    # interleave the modes so drift affects each equally; every run analyzes fresh tickers
+    for i in range(runs):
+        for label, traced, profile in MODES:
+            config.TRACE_PROFILE = profile
+            samples[label].append(await analyze(f"{prefix}{i:03d}{label[:2].upper()}", traced))
+    await http_client.close_client()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=config.FIXTURE_DIR)
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--span-calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    disabled, enabled = span_cost(args.span_calls)
+    print(f"span() without a trace {disabled * 1e9:>8.0f} ns   with a trace {enabled * 1e9:>8.0f} ns")
+
+    config.TRACE_SLOW_MS = float("inf")
+    http_client.set_transport(ReplayTransport(args.fixtures))
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run(2, "W"))  # warm up the scoring engine, parsers and client
+        samples = asyncio.run(run(args.runs, "T"))
+
+    baseline = statistics.median(samples["untraced"])
+    for label, values in samples.items():
+        median = statistics.median(values)
+        print(f"{label:<16} analyze_ticker median {median * 1000:>7.2f} ms   "
+              f"{(median / baseline - 1) * 100:>+6.1f}% vs untraced")
+
+
+if __name__ == "__main__":
+    main()
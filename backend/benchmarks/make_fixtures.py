@@ -0,0 +1,43 @@
+"""Regenerate ``benchmarks/fixtures`` by recording requests.
+
+By default this records from the synthetic stub feeds, so the fixture set is
+deterministic and needs no network. ``--live`` records real upstream responses
+instead. Run from ``backend/``: ``python benchmarks/make_fixtures.py``.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import config
+import http_client
+import service
+from benchmarks.stub_feeds import stub_transport
+from replay import RecordingTransport
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="record real upstream responses")
+    parser.add_argument("--output", default=config.FIXTURE_DIR)
+    parser.add_argument("tickers", nargs="*", default=TICKERS)
+    args = parser.parse_args()
+
+    shutil.rmtree(args.output, ignore_errors=True)
+    inner = None if args.live else stub_transport(latency=0.0, seed=42)
+    http_client.set_transport(RecordingTransport(args.output, inner))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for ticker in args.tickers:
+            service.analyze_ticker(ticker)
+    print(f"Recorded {len(os.listdir(args.output))} fixtures into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
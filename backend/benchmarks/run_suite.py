@@ -0,0 +1,185 @@
+"""Offline benchmark suite for the analysis pipeline, producing a comparable JSON report.
+
+All upstream traffic is served by ``replay.ReplayTransport`` from ``benchmarks/fixtures``
+with injected latency and failures; nothing touches the network.
+
+Run from ``backend/``::
+
+    python benchmarks/run_suite.py --output before.json
+    python benchmarks/run_suite.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+
+import httpx
+
+import config
+import http_client
+import scoring
+from replay import ReplayTransport
+
+
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(pick(0.50) * 1000, 3),
+        "p95_ms": round(pick(0.95) * 1000, 3),
+        "p99_ms": round(pick(0.99) * 1000, 3),
+    }
+
+
+def bench_analyze(runs: int) -> dict:
+    import service
+
+    async def run() -> list:
+        samples = []
+        for i in range(runs):
+            start = time.perf_counter()
+            await service.analyze_ticker_async(f"R{i:03d}")
+            samples.append(time.perf_counter() - start)
+        await http_client.close_client()
+        return samples
+
+    return percentiles(asyncio.run(run()))
+
+
+def bench_scoring(count: int) -> dict:
+    from benchmarks.bench_scoring import make_texts
+
+    texts = make_texts(count, count // 2)
+    scoring._memo.clear()
+    start = time.perf_counter()
+    scoring.score_texts(texts)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    scoring.score_texts(texts)
+    warm = time.perf_counter() - start
+    return {"articles": count, "cold_per_sec": round(count / cold), "warm_per_sec": round(count / warm)}
+
+
+def bench_aggregation(sizes: list) -> dict:
+    from aggregation import build_analysis
+    from benchmarks.bench_aggregation import make_articles
+
+    now = datetime.now()
+    results = {}
+    for size in sizes:
+        articles = make_articles(size, now, seed=size)
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            build_analysis(articles, {}, now)
+            best = min(best, time.perf_counter() - start)
+        results[str(size)] = round(best * 1000, 3)
+    return {"best_ms": results}
+
+
+def bench_endpoints(concurrency: int, requests: int) -> dict:
+    import main
+
+    async def run() -> dict:
+        transport = httpx.ASGITransport(app=main.app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, path in (("analyze_cold", "/analyze/C{i:04d}"), ("analyze_hot", "/analyze/HOT"),
+                                ("stream_cold", "/analyze/S{i:04d}/stream")):
+                semaphore = asyncio.Semaphore(concurrency)
+                samples = []
+
+                async def call(i: int) -> None:
+                    async with semaphore:
+                        start = time.perf_counter()
+                        response = await client.get(path.format(i=i))
+                        response.raise_for_status()
+                        samples.append(time.perf_counter() - start)
+
+                if "{i}" not in path:
+                    # one untimed request fills the cache, so the timed ones are hits
+                    (await client.get(path)).raise_for_status()
+                start = time.perf_counter()
+                await asyncio.gather(*(call(i) for i in range(requests)))
+                elapsed = time.perf_counter() - start
+                results[label] = {**percentiles(samples), "req_per_sec": round(requests / elapsed, 1)}
+        await http_client.close_client()
+        return results
+
+    return {"concurrency": concurrency, **asyncio.run(run())}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return "unknown"
+
+
+def compare(report: dict, baseline: dict, prefix: str = "") -> None:
+    for key, value in report.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        if isinstance(value, dict) and isinstance(old, dict):
+            compare(value, old, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            print(f"{prefix}{key:<40} {old:>12} -> {value:>12} ({(value - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=config.FIXTURE_DIR)
+    parser.add_argument("--latency", type=float, default=0.05, help="injected upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=30, help="sequential analyze_ticker runs")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    http_client.set_transport(ReplayTransport(args.fixtures, latency=args.latency, jitter=args.jitter,
+                                              failure_rate=args.failure_rate))
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {"latency": args.latency, "jitter": args.jitter, "failure_rate": args.failure_rate},
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        report["analyze_ticker"] = bench_analyze(args.runs)
+        report["scoring"] = bench_scoring(20000)
+        report["aggregation"] = bench_aggregation([1000, 10000, 100000])
+        report["endpoints"] = bench_endpoints(args.concurrency, args.requests)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
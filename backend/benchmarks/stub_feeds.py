@@ -0,0 +1,100 @@
+import asyncio
+import json
+import random
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+HEADLINES = [
+    "{t} shares surge after earnings beat expectations",
+    "{t} stock falls as analysts warn of weak guidance",
+    "Investors cheer {t} record quarterly deliveries",
+    "{t} faces lawsuit over disappointing product launch",
+    "Why {t} could be a great long term buy",
+    "{t} announces layoffs amid slowing demand",
+    "{t} rallies on strong growth outlook and upgrade",
+    "Concerns mount over {t} debt and falling margins",
+]
+
+
+def _headlines(ticker: str, count: int, rng: random.Random) -> list:
+    return [rng.choice(HEADLINES).format(t=ticker) + f" ({i})" for i in range(count)]
+
+
+def _ticker_from(request: httpx.Request) -> str:
+    params = request.url.params
+    for key in ("symbols", "symbol", "tickers"):
+        if key in params:
+            return params[key].split(",")[0]
+    if "q" in params:
+        return params["q"].split(" ")[0].split("+")[0]
+    if request.url.host == "seekingalpha.com":
+        return request.url.path.rsplit("/", 1)[-1].split(".")[0]
+    return request.url.path.split("/")[2]
+
+
+def _rss(ticker: str, count: int, rng: random.Random) -> bytes:
+    now = datetime.now(timezone.utc)
+    items = "".join(
+        f"<item><title>{title}</title><description>{title} summary</description>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=rng.randint(0, 160)))}</pubDate></item>"
+        for title in _headlines(ticker, count, rng)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{ticker}</title>{items}</channel></rss>'.encode()
+
+
+def _json(payload) -> bytes:
+    return json.dumps(payload).encode()
+
+
+def render(request: httpx.Request, rng: random.Random) -> httpx.Response:
+    host = request.url.host
+    ticker = _ticker_from(request)
+    now = datetime.now()
+    if host == "query1.finance.yahoo.com":
+        symbols = request.url.params.get("symbols", ticker).split(",")
+        result = [{"symbol": s, "longName": f"{s} Inc.", "sector": "Technology", "regularMarketPrice": 100.0} for s in symbols]
+        return httpx.Response(200, content=_json({"quoteResponse": {"result": result}}))
+    if host == "finance.yahoo.com":
+        body = "".join(f"<div><h3><a>{title}</a></h3><p>filler text</p></div>" for title in _headlines(ticker, 20, rng))
+        return httpx.Response(200, content=f"<html><body>{body}</body></html>".encode())
+    if host in ("news.google.com", "www.bing.com", "seekingalpha.com"):
+        return httpx.Response(200, content=_rss(ticker, 20, rng))
+    if host == "www.alphavantage.co":
+        feed = [{"title": title, "summary": "", "time_published": (now - timedelta(hours=rng.randint(0, 160))).strftime("%Y%m%dT%H%M%S")}
+                for title in _headlines(ticker, 15, rng)]
+        return httpx.Response(200, content=_json({"feed": feed}))
+    if host == "finnhub.io":
+        items = [{"headline": title, "summary": "", "datetime": int(time.time()) - rng.randint(0, 500000)}
+                 for title in _headlines(ticker, 10, rng)]
+        return httpx.Response(200, content=_json(items))
+    if host == "api.marketaux.com":
+        items = [{"title": title, "description": "", "published_at": (now - timedelta(hours=rng.randint(0, 160))).isoformat()}
+                 for title in _headlines(ticker, 10, rng)]
+        return httpx.Response(200, content=_json({"data": items}))
+    return httpx.Response(404)
+
+
+def stub_transport(latency: float = 0.05, jitter: float = 0.0, seed: int = 0, slow: dict = None,
+                   tail: dict = None) -> httpx.MockTransport:
+    """In-memory stand-in for every upstream feed with simulated network latency.
+
+    ``slow`` maps a host to an extra delay in seconds so straggler sources can be simulated.
+    ``tail`` maps a host to ``(probability, delay)``: that share of its requests stall
+    for ``delay`` extra seconds, for tail-latency tests.
+    """
+    rng = random.Random(seed)
+    slow = slow or {}
+    tail = tail or {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        delay = latency + rng.random() * jitter + slow.get(request.url.host, 0.0)
+        probability, stall = tail.get(request.url.host, (0.0, 0.0))
+        if probability and rng.random() < probability:
+            delay += stall
+        await asyncio.sleep(delay)
+        return render(request, rng)
+
+    return httpx.MockTransport(handler)
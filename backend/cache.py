@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+from service import analyze_ticker_async
+
+
+class SQLiteBackend:
+    """Shared cache store so several workers on one host see each other's results.
+
+    The ``leases`` table gives cross-process single-flight: a worker loads a key only
+    while it holds the key's lease, and the others wait for the shared result.
+    """
+
+    def __init__(self, path: str, max_age: float = 86400):
+        self.path = path
+        self.max_age = max_age
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_stored_at ON cache (stored_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: float) -> None:
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)", (key, payload, stored_at)
+            )
+            self._conn.execute("DELETE FROM cache WHERE stored_at < ?", (stored_at - self.max_age,))
+
+    def changed_since(self, since: float) -> List[Tuple[str, Any, float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, stored_at FROM cache WHERE stored_at > ? ORDER BY stored_at", (since,)
+            ).fetchall()
+        return [(key, json.loads(value), stored_at) for key, value, stored_at in rows]
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Take ``key``'s lease unless another live owner holds it; expired leases are taken over."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (key, self.owner, now + ttl, now)
+            )
+        return cursor.rowcount == 1
+
+    def release_lease(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner))
+
+
+class ResultCache:
+    """Bounded LRU with TTL, stale-while-revalidate and single-flight loading.
+
+    Entries younger than ``ttl`` are served as hits. Entries up to ``stale_ttl`` past
+    expiry are served immediately while one background refresh runs. Concurrent
+    misses for the same key await a single ``loader`` call; with a shared ``backend``
+    that also holds across worker processes. Backend calls can wait on another
+    worker's SQLite lock, so they run in worker threads, never on the event loop.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+        max_entries: int = 512,
+        backend: Optional[SQLiteBackend] = None,
+        lease_ttl: float = 30,
+        lease_poll: float = 0.1,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.lease_ttl = lease_ttl
+        self.lease_poll = lease_poll
+        self._synced_at = 0.0
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._writes: set = set()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'coalesced': 0, 'backend_hits': 0, 'refreshes': 0, 'errors': 0, 'remote_loads': 0}
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value: Any, stored_at: float) -> None:
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def peek(self, key: str, ttl: Optional[float] = None, serve: bool = False) -> Optional[Any]:
+        """Return the cached value if it is fresh, without loading or refreshing.
+
+        A plain peek (the screener checking what to rescore) changes nothing. With
+        ``serve`` set the value is answering a request, so it counts as a hit and as
+        a use for the LRU order.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = self._lookup(key) if serve else self._entries.get(key)
+        if entry is None or time.time() - entry[1] >= ttl:
+            return None
+        if serve:
+            self._counters['hits'] += 1
+        return entry[0]
+
+    def age(self, key: str) -> Optional[float]:
+        entry = self._entries.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def subscribe(self, listener: Callable[[str, Any], None]) -> None:
+        """Call ``listener(key, value)`` whenever a fresh value is stored."""
+        self._listeners.append(listener)
+
+    def put(self, key: str, value: Any) -> Optional[asyncio.Future]:
+        """Store ``value``; returns the pending backend write, if there is a backend."""
+        stored_at = time.time()
+        self._store(key, value, stored_at)
+        write = None
+        if self.backend is not None:
+            write = asyncio.ensure_future(asyncio.to_thread(self.backend.set, key, value, stored_at))
+            self._writes.add(write)
+            write.add_done_callback(self._writes.discard)
+            write.add_done_callback(_consume_exception)
+        for listener in self._listeners:
+            listener(key, value)
+        return write
+
+    async def sync(self) -> int:
+        """Pull results other workers stored since the last sync and notify listeners."""
+        if self.backend is None:
+            return 0
+        changed = await asyncio.to_thread(self.backend.changed_since, self._synced_at)
+        for key, value, stored_at in changed:
+            entry = self._entries.get(key)
+            if entry is None or stored_at > entry[1]:
+                self._store(key, value, stored_at)
+                for listener in self._listeners:
+                    listener(key, value)
+            self._synced_at = max(self._synced_at, stored_at)
+        return len(changed)
+
+    async def get(self, key: str, ttl: Optional[float] = None) -> Any:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        entry = self._lookup(key)
+
+        if (entry is None or now - entry[1] >= ttl) and self.backend is not None:
+            shared = await asyncio.to_thread(self.backend.get, key)
+            if shared is not None and (entry is None or shared[1] > entry[1]):
+                self._store(key, *shared)
+                entry = shared
+                if now - entry[1] < ttl:
+                    self._counters['backend_hits'] += 1
+
+        if entry is not None:
+            age = now - entry[1]
+            if age < ttl:
+                self._counters['hits'] += 1
+                return entry[0]
+            if age < ttl + self.stale_ttl:
+                self._counters['stale'] += 1
+                self.refresh(key)
+                return entry[0]
+
+        self._counters['misses'] += 1
+        return await self._load(key)
+
+    def refresh(self, key: str) -> asyncio.Future:
+        """Start (or join) a background reload of ``key``."""
+        future = self._inflight.get(key)
+        if future is None:
+            self._counters['refreshes'] += 1
+            future = self._start(key)
+            future.add_done_callback(_consume_exception)
+        return future
+
+    async def _load(self, key: str) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self._counters['coalesced'] += 1
+        else:
+            future = self._start(key)
+        return await asyncio.shield(future)
+
+    def _start(self, key: str) -> asyncio.Future:
+        future = asyncio.ensure_future(self._run_loader(key))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    async def _run_loader(self, key: str) -> Any:
+        if self.backend is not None:
+            started = time.time()
+            while not await asyncio.to_thread(self.backend.acquire_lease, key, self.lease_ttl):
+                # another worker is loading this key; wait for its result to land
+                await asyncio.sleep(self.lease_poll)
+                shared = await asyncio.to_thread(self.backend.get, key)
+                if shared is not None and shared[1] >= started:
+                    self._counters['remote_loads'] += 1
+                    self._store(key, *shared)
+                    return shared[0]
+        try:
+            value = await self.loader(key)
+            write = self.put(key, value)
+            if write is not None:
+                # workers waiting on the lease read the result once it is released
+                await write
+        except Exception:
+            self._counters['errors'] += 1
+            raise
+        finally:
+            if self.backend is not None:
+                await asyncio.to_thread(self.backend.release_lease, key)
+        return value
+
+    def stats(self) -> Dict:
+        return {**self._counters, 'entries': len(self._entries), 'inflight': len(self._inflight)}
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Cache background error: {future.exception()}")
+
+
+analysis_cache = ResultCache(
+    analyze_ticker_async,
+    ttl=config.ANALYZE_CACHE_TTL,
+    stale_ttl=config.ANALYZE_CACHE_STALE_TTL,
+    max_entries=config.CACHE_MAX_ENTRIES,
+    backend=SQLiteBackend(config.CACHE_DB_PATH) if config.CACHE_DB_PATH else None,
+    lease_ttl=config.CACHE_LEASE_TTL,
+)
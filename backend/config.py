@@ -0,0 +1,121 @@
+import os
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+# Result cache. TTLs are seconds; each endpoint picks its own TTL.
+CACHE_MAX_ENTRIES = _int("CACHE_MAX_ENTRIES", 512)
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "")
+ANALYZE_CACHE_TTL = _float("ANALYZE_CACHE_TTL", 300)
+ANALYZE_CACHE_STALE_TTL = _float("ANALYZE_CACHE_STALE_TTL", 900)
+
+# Multi-worker mode: workers share CACHE_DB_PATH for results and load leases, and
+# RATE_LIMIT_DB_PATH for per-source token buckets. WORKERS=0 sizes to the CPU count.
+WORKERS = _int("WORKERS", 0)
+CACHE_LEASE_TTL = _float("CACHE_LEASE_TTL", 30)
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", CACHE_DB_PATH)
+
+# Outbound politeness for background and batch traffic (/analyze/batch, the screener and
+# prefetch refreshes): requests/second and burst per news source (0 disables).
+# Single-ticker /analyze requests are not throttled.
+SOURCE_RATE_LIMIT = _float("SOURCE_RATE_LIMIT", 20)
+SOURCE_RATE_BURST = _float("SOURCE_RATE_BURST", 40)
+
+# Batch analysis.
+BATCH_MAX_TICKERS = _int("BATCH_MAX_TICKERS", 200)
+BATCH_CONCURRENCY = _int("BATCH_CONCURRENCY", 64)
+QUOTE_BATCH_SIZE = _int("QUOTE_BATCH_SIZE", 50)
+
+# Article store: deduplicated, pre-scored headlines per ticker.
+ARTICLE_DB_PATH = os.getenv("ARTICLE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "articles.db"))
+ARTICLE_LOOKBACK_DAYS = _float("ARTICLE_LOOKBACK_DAYS", 7)
+
+# Background prefetch of frequently requested tickers.
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "0").lower() in ("1", "true", "yes")
+PREFETCH_TOP_N = _int("PREFETCH_TOP_N", 20)
+PREFETCH_INTERVAL = _float("PREFETCH_INTERVAL", 240)
+PREFETCH_JITTER = _float("PREFETCH_JITTER", 0.1)
+PREFETCH_CONCURRENCY = _int("PREFETCH_CONCURRENCY", 4)
+PREFETCH_DECAY = _float("PREFETCH_DECAY", 0.5)
+
+# Batch sentiment scoring.
+SCORE_MEMO_SIZE = _int("SCORE_MEMO_SIZE", 100000)
+SCORE_POOL_MIN_TEXTS = _int("SCORE_POOL_MIN_TEXTS", 2000)
+
+# Sentiment engine: "finance" (VADER plus finance lexicon and phrase rules) or "vader".
+# Both load the compiled lexicon at LEXICON_CACHE_PATH ("" parses VADER's text files instead);
+# WARMUP_ON_STARTUP loads the engine and feedparser's summary sanitizer in the background
+# at app startup (the streaming parsers themselves need no warm-up).
+SCORING_ENGINE = os.getenv("SCORING_ENGINE", "finance")
+LEXICON_CACHE_PATH = os.getenv("LEXICON_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicon.bin"))
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1").lower() in ("1", "true", "yes")
+
+# Outbound HTTP. SOURCE_TIMEOUTS overrides the default per source, e.g.
+# "Seeking Alpha=3,Alpha Vantage=4".
+HOST_MAX_CONNECTIONS = _int("HOST_MAX_CONNECTIONS", 10)
+FETCH_RETRIES = _int("FETCH_RETRIES", 2)
+FETCH_BACKOFF = _float("FETCH_BACKOFF", 0.2)
+CONDITIONAL_CACHE_SIZE = _int("CONDITIONAL_CACHE_SIZE", 2048)
+SOURCE_TIMEOUTS = {
+    name.strip(): float(seconds)
+    for name, _, seconds in (item.partition("=") for item in os.getenv("SOURCE_TIMEOUTS", "").split(",") if item.strip())
+}
+# Streamed (HTML/RSS) responses stop once parsed; at most this many leftover bytes are
+# drained to keep the connection reusable, larger remainders close it.
+STREAM_DRAIN_BYTES = _int("STREAM_DRAIN_BYTES", 65536)
+
+# Circuit breaker: skip a source after this many consecutive failures, retry after cooldown seconds.
+BREAKER_FAILURES = _int("BREAKER_FAILURES", 3)
+BREAKER_COOLDOWN = _float("BREAKER_COOLDOWN", 60)
+
+# Source fan-out. Each source's timeout is FANOUT_TIMEOUT_FACTOR times its recent
+# FANOUT_PERCENTILE latency (over its last FANOUT_WINDOW calls, once it has
+# FANOUT_MIN_SAMPLES), kept between FANOUT_MIN_TIMEOUT and the 6 s default.
+# A single-ticker analysis stops waiting FANOUT_DEADLINE seconds after it starts,
+# or FANOUT_QUORUM_GRACE seconds after FANOUT_QUORUM_SOURCES sources have answered
+# or FANOUT_QUORUM_ARTICLES articles have arrived; sources still running then are
+# cancelled (0 disables a limit).
+FANOUT_PERCENTILE = _float("FANOUT_PERCENTILE", 0.95)
+FANOUT_TIMEOUT_FACTOR = _float("FANOUT_TIMEOUT_FACTOR", 1.5)
+FANOUT_WINDOW = _int("FANOUT_WINDOW", 200)
+FANOUT_MIN_SAMPLES = _int("FANOUT_MIN_SAMPLES", 20)
+FANOUT_MIN_TIMEOUT = _float("FANOUT_MIN_TIMEOUT", 1.0)
+FANOUT_DEADLINE = _float("FANOUT_DEADLINE", 5.0)
+FANOUT_QUORUM_SOURCES = _int("FANOUT_QUORUM_SOURCES", 5)
+FANOUT_QUORUM_ARTICLES = _int("FANOUT_QUORUM_ARTICLES", 0)
+FANOUT_QUORUM_GRACE = _float("FANOUT_QUORUM_GRACE", 0.25)
+
+# Outbound HTTP mode: "live", "record" (save responses to FIXTURE_DIR) or "replay"
+# (serve FIXTURE_DIR with REPLAY_LATENCY seconds delay and REPLAY_FAILURE_RATE failures).
+HTTP_MODE = os.getenv("HTTP_MODE", "live")
+FIXTURE_DIR = os.getenv("FIXTURE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures"))
+REPLAY_LATENCY = _float("REPLAY_LATENCY", 0)
+REPLAY_FAILURE_RATE = _float("REPLAY_FAILURE_RATE", 0)
+
+# Sentiment history (time series with hourly/daily rollups).
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", ARTICLE_DB_PATH)
+HISTORY_DEFAULT_DAYS = _float("HISTORY_DEFAULT_DAYS", 7)
+
+# Market screener. The universe file holds one "SYMBOL[,Sector]" per line.
+SCREENER_ENABLED = os.getenv("SCREENER_ENABLED", "0").lower() in ("1", "true", "yes")
+SCREENER_UNIVERSE_FILE = os.getenv("SCREENER_UNIVERSE_FILE", os.path.join(os.path.dirname(__file__), "universe.txt"))
+SCREENER_INTERVAL = _float("SCREENER_INTERVAL", 1800)
+SCREENER_CHUNK_SIZE = _int("SCREENER_CHUNK_SIZE", 100)
+
+# Request tracing: per-stage timings for /analyze in a Server-Timing header (and in the
+# body with ?debug=timing). TRACE_ENABLED traces every request; otherwise only requests
+# asking for ?debug=timing are traced. Traced requests slower than TRACE_SLOW_MS are
+# logged and kept for /debug/slow; with TRACE_PROFILE they also keep the event loop's
+# stacks, sampled every TRACE_PROFILE_INTERVAL seconds.
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "0").lower() in ("1", "true", "yes")
+TRACE_SLOW_MS = _float("TRACE_SLOW_MS", 2000)
+TRACE_SLOW_KEEP = _int("TRACE_SLOW_KEEP", 50)
+TRACE_PROFILE = os.getenv("TRACE_PROFILE", "0").lower() in ("1", "true", "yes")
+TRACE_PROFILE_INTERVAL = _float("TRACE_PROFILE_INTERVAL", 0.005)
+TRACE_PROFILE_STACKS = _int("TRACE_PROFILE_STACKS", 50)
@@ -0,0 +1,117 @@
+"""Source fan-out: learned per-source timeouts, a deadline and an early-return quorum.
+
+Without a bound, one hanging source sets the latency of every analysis. Each source
+is instead timed out at a multiple of its own recent latency percentile, and the
+fan-out as a whole stops once its deadline passes or, shortly after, once enough
+sources have answered. Sources still running at that point are cancelled and
+reported as such, so callers can say which sources a result includes.
+"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple
+
+import config
+from metrics import SourceMetrics
+
+SourceResult = Tuple[str, List, Optional[Exception]]
+
+
+class SourceCancelled(Exception):
+    """The fan-out stopped waiting for this source ('deadline' or 'quorum')."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SourceDeadlines:
+    """Per-source timeouts from recent latencies: ``factor`` x the ``percentile`` latency.
+
+    Timed-out calls count as samples at their timeout, so a source that slows down
+    pushes its own timeout up (to ``ceiling``) instead of timing out forever.
+    """
+
+    def __init__(self, metrics: SourceMetrics, ceiling: float, percentile: float = config.FANOUT_PERCENTILE,
+                 factor: float = config.FANOUT_TIMEOUT_FACTOR, floor: float = config.FANOUT_MIN_TIMEOUT,
+                 min_samples: int = config.FANOUT_MIN_SAMPLES):
+        self.metrics = metrics
+        self.ceiling = ceiling
+        self.percentile = percentile
+        self.factor = factor
+        self.floor = floor
+        self.min_samples = min_samples
+
+    def timeout(self, source: str) -> float:
+        latency = self.metrics.percentile(source, self.percentile, self.min_samples)
+        if latency is None:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, latency * self.factor))
+
+
+class FanOutPolicy:
+    """When a fan-out stops waiting: ``deadline`` seconds after it starts, or ``grace``
+    seconds after ``quorum_sources`` sources answered or ``quorum_articles`` articles
+    arrived. Zero disables a limit; the default policy waits for every source.
+    """
+
+    def __init__(self, deadline: float = 0, quorum_sources: int = 0, quorum_articles: int = 0, grace: float = 0):
+        self.deadline = deadline
+        self.quorum_sources = quorum_sources
+        self.quorum_articles = quorum_articles
+        self.grace = grace
+
+    @classmethod
+    def from_config(cls) -> "FanOutPolicy":
+        return cls(config.FANOUT_DEADLINE, config.FANOUT_QUORUM_SOURCES, config.FANOUT_QUORUM_ARTICLES,
+                   config.FANOUT_QUORUM_GRACE)
+
+    def quorum_met(self, sources: int, articles: int) -> bool:
+        return bool((self.quorum_sources and sources >= self.quorum_sources)
+                    or (self.quorum_articles and articles >= self.quorum_articles))
+
+
+async def fan_out(calls: Iterable[Tuple[str, Awaitable[SourceResult]]], policy: FanOutPolicy,
+                  started: float = None) -> AsyncIterator[SourceResult]:
+    """Yield ``(source, articles, error)`` for every call, in completion order.
+
+    ``calls`` pairs each source with an awaitable that returns that triple and does not
+    raise. ``started`` is the loop time the deadline counts from (default: now). Calls
+    still running when ``policy`` stops waiting are cancelled and yielded last, with
+    no articles and a ``SourceCancelled`` error.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time() if started is None else started
+    stop_at = started + policy.deadline if policy.deadline else None
+    names: Dict[asyncio.Future, str] = {asyncio.ensure_future(call): source for source, call in calls}
+    pending = set(names)
+    answered = articles = 0
+    reason = 'deadline'
+
+    try:
+        while pending:
+            timeout = None if stop_at is None else max(0.0, stop_at - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                result = task.result()
+                if result[2] is None:
+                    answered += 1
+                    articles += len(result[1])
+                yield result
+            if pending and reason != 'quorum' and policy.quorum_met(answered, articles):
+                reason = 'quorum'
+                grace_end = loop.time() + policy.grace
+                stop_at = grace_end if stop_at is None else min(stop_at, grace_end)
+
+        stragglers = [task for task in names if task in pending]
+        for task in stragglers:
+            task.cancel()
+        results = await asyncio.gather(*stragglers, return_exceptions=True)
+        pending = set()
+        for task, result in zip(stragglers, results):
+            # a call can finish between the last wait and its cancellation
+            yield result if isinstance(result, tuple) else (names[task], [], SourceCancelled(reason))
+    finally:
+        # the consumer stopped early; do not leave calls running behind it
+        for task in pending:
+            task.cancel()
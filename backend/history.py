@@ -0,0 +1,106 @@
+import math
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import config
+
+INTERVALS = {'hour': 3600, 'day': 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment_points (
+    ticker TEXT NOT NULL,
+    day TEXT NOT NULL,
+    ts REAL NOT NULL,
+    compound REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sentiment_points_partition ON sentiment_points (ticker, day);
+CREATE TABLE IF NOT EXISTS sentiment_rollups (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    bullish INTEGER NOT NULL,
+    bearish INTEGER NOT NULL,
+    PRIMARY KEY (ticker, interval, bucket)
+) WITHOUT ROWID;
+"""
+
+UPSERT_ROLLUP = """
+INSERT INTO sentiment_rollups (ticker, interval, bucket, count, total, total_sq, bullish, bearish)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (ticker, interval, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    total = total + excluded.total,
+    total_sq = total_sq + excluded.total_sq,
+    bullish = bullish + excluded.bullish,
+    bearish = bearish + excluded.bearish
+"""
+
+
+class SentimentHistory:
+    """Append-only scored articles per (ticker, UTC day) with incrementally maintained rollups.
+
+    Each insert folds the new points into hourly and daily buckets holding count,
+    sum, sum of squares and bullish/bearish counts, so range queries read only the
+    rollup rows and never rescan raw points.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def append(self, ticker: str, articles: List[Dict]) -> None:
+        if not articles:
+            return
+        points = []
+        buckets: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0, 0])
+        for article in articles:
+            ts = article['published'].timestamp()
+            compound = article['compound']
+            points.append((ticker, datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d'), ts, compound))
+            for interval, seconds in INTERVALS.items():
+                bucket = buckets[(interval, int(ts // seconds * seconds))]
+                bucket[0] += 1
+                bucket[1] += compound
+                bucket[2] += compound * compound
+                bucket[3] += compound > 0.05
+                bucket[4] += compound < -0.05
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO sentiment_points (ticker, day, ts, compound) VALUES (?, ?, ?, ?)", points
+            )
+            self._conn.executemany(
+                UPSERT_ROLLUP, [(ticker, interval, bucket, *values) for (interval, bucket), values in buckets.items()]
+            )
+
+    def query(self, ticker: str, start: float, end: float, interval: str = 'hour') -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, count, total, total_sq, bullish, bearish FROM sentiment_rollups"
+                " WHERE ticker = ? AND interval = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (ticker, interval, int(start // INTERVALS[interval] * INTERVALS[interval]), end),
+            ).fetchall()
+
+        series = []
+        for bucket, count, total, total_sq, bullish, bearish in rows:
+            mean = total / count
+            series.append({
+                'start': datetime.fromtimestamp(bucket, timezone.utc).isoformat(),
+                'count': count,
+                'mean': round(mean, 4),
+                'bullish_ratio': round(bullish / count, 3),
+                'bearish_ratio': round(bearish / count, 3),
+                'volatility': round(math.sqrt(max(total_sq / count - mean * mean, 0.0)), 4)
+            })
+        return series
+
+
+sentiment_history = SentimentHistory(config.HISTORY_DB_PATH)
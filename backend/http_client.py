@@ -0,0 +1,184 @@
+import asyncio
+import random
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+import config
+import replay
+
+DEFAULT_TIMEOUT = 5.0
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+HOST_LIMITS = httpx.Limits(
+    max_connections=config.HOST_MAX_CONNECTIONS,
+    max_keepalive_connections=config.HOST_MAX_CONNECTIONS,
+    keepalive_expiry=30.0,
+)
+
+# Upstream hosts that get their own keep-alive pool, so one busy host cannot
+# starve the connections available to the others.
+UPSTREAM_HOSTS = [
+    "news.google.com",
+    "www.bing.com",
+    "finance.yahoo.com",
+    "query1.finance.yahoo.com",
+    "finnhub.io",
+    "api.marketaux.com",
+    "seekingalpha.com",
+    "www.alphavantage.co",
+]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# One pooled client per event loop: httpx clients cannot be shared across loops.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_transport: Optional[httpx.AsyncBaseTransport] = replay.transport_from_config(
+    config.HTTP_MODE, config.FIXTURE_DIR, config.REPLAY_LATENCY, config.REPLAY_FAILURE_RATE
+)
+
+# url -> (etag, last_modified, parsed result) for conditional requests
+_validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], Any]]" = OrderedDict()
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_lock = threading.Lock()
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Route all outbound requests through ``transport`` (stubs, replay, benchmarks)."""
+    global _transport
+    _transport = transport
+    _clients.clear()
+    _validators.clear()
+
+
+def get_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        if _transport is not None:
+            client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, follow_redirects=True, transport=_transport)
+        else:
+            mounts = {f"all://{host}": httpx.AsyncHTTPTransport(limits=HOST_LIMITS) for host in UPSTREAM_HOSTS}
+            client = httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT,
+                limits=POOL_LIMITS,
+                follow_redirects=True,
+                mounts=mounts,
+            )
+        _clients[loop] = client
+    return client
+
+
+async def close_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def source_timeout(source: str) -> float:
+    return config.SOURCE_TIMEOUTS.get(source, DEFAULT_TIMEOUT)
+
+
+def _remember(url: str, response: httpx.Response, parsed: Any) -> None:
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag or last_modified:
+        _validators[url] = (etag, last_modified, parsed)
+        _validators.move_to_end(url)
+        while len(_validators) > config.CONDITIONAL_CACHE_SIZE:
+            _validators.popitem(last=False)
+
+
+async def _read(response: httpx.Response, parser: Any) -> Any:
+    """Feed the body to ``parser`` until it has enough, then stop reading.
+
+    A small remainder is still drained so the connection can go back to the pool;
+    past ``STREAM_DRAIN_BYTES`` the connection is closed instead.
+    """
+    chunks = response.aiter_bytes()
+    async for chunk in chunks:
+        if parser.feed_bytes(chunk):
+            drained = 0
+            async for rest in chunks:
+                drained += len(rest)
+                if drained > config.STREAM_DRAIN_BYTES:
+                    break
+            break
+    return parser.finish()
+
+
+async def fetch(source: str, url: str, parse: Callable[[bytes], Any], headers: Dict[str, str] = None,
+                stream: bool = False) -> Optional[Any]:
+    """GET ``url`` for ``source`` and return ``parse(body)``.
+
+    With ``stream`` set, ``parse`` is instead called with the response charset and must
+    return an incremental parser (see ``parsing``); it is fed the body as it arrives and
+    may stop the download early.
+
+    Raises ``httpx.HTTPStatusError`` for 4xx/5xx responses and for 3xx responses
+    left after following redirects (one without a ``Location``). Returns None for a
+    304 with no cached result to reuse and for other non-200 2xx responses.
+
+    Uses the source's timeout, retries transport errors and throttling/5xx responses
+    with exponential backoff, and revalidates with ETag/Last-Modified so a 304 returns
+    the previously parsed result without parsing again.
+    """
+    request_headers = dict(headers or {})
+    cached = _validators.get(url)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    timeout = source_timeout(source)
+    client = get_client()
+    for attempt in range(config.FETCH_RETRIES + 1):
+        try:
+            request = client.build_request("GET", url, headers=request_headers, timeout=timeout)
+            response = await client.send(request, stream=True)
+            if not stream:
+                await response.aread()
+        except httpx.TransportError:
+            if attempt == config.FETCH_RETRIES:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == config.FETCH_RETRIES:
+                break
+            await response.aclose()
+        await asyncio.sleep(config.FETCH_BACKOFF * (2 ** attempt) * (1 + random.random()))
+
+    try:
+        if response.status_code == 304:
+            if cached is None:
+                # not modified, but nothing from an earlier response to return
+                return None
+            _validators.move_to_end(url)
+            return cached[2]
+        response.raise_for_status()
+        if response.status_code != 200:
+            return None
+        parsed = await _read(response, parse(response.charset_encoding)) if stream else parse(response.content)
+    finally:
+        await response.aclose()
+    _remember(url, response, parsed)
+    return parsed
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_sync_loop.run_forever, name="http-sync-loop", daemon=True)
+            thread.start()
+        return _sync_loop
+
+
+def run_sync(coro):
+    """Run ``coro`` on a shared background loop so sync callers reuse one connection pool."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
@@ -0,0 +1,222 @@
+"""Finance lexicon, phrase rules and the compiled lexicon file shared by the scoring engines.
+
+The compiled file holds VADER's lexicon and emoji table plus the finance overlay in
+one flat binary layout. It is written once (by ``serve.py`` before workers start, or by
+the first process that needs it) and every worker memory-maps it instead of parsing
+the text lexicons. That only makes loading cheaper: each worker still copies the
+tables into its own dicts, because VADER looks words up in a dict, so the lexicon's
+memory is not shared between workers::
+
+    python lexicon.py            # (re)compile to LEXICON_CACHE_PATH
+"""
+import hashlib
+import mmap
+import os
+import re
+import string
+import struct
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import config
+
+# Valences on VADER's -4..4 scale for finance terms VADER misses or underrates.
+FINANCE_LEXICON = {
+    'beat': 1.5, 'beats': 1.5, 'upgrade': 1.8, 'upgrades': 1.8, 'upgraded': 1.8,
+    'outperform': 2.0, 'outperforms': 2.0, 'outperformed': 2.0, 'overweight': 1.2,
+    'bullish': 2.0, 'rally': 1.6, 'rallies': 1.6, 'rallied': 1.6, 'surge': 1.8, 'surges': 1.8,
+    'surged': 1.8, 'soar': 2.0, 'soars': 2.0, 'soared': 2.0, 'rebound': 1.2, 'rebounds': 1.2,
+    'rebounded': 1.2, 'upside': 1.2, 'tailwind': 1.2, 'tailwinds': 1.2, 'buyback': 1.2,
+    'buybacks': 1.2, 'accretive': 1.2, 'breakout': 1.2,
+    'downgrade': -1.8, 'downgrades': -1.8, 'downgraded': -1.8, 'underperform': -1.8,
+    'underperforms': -1.8, 'underperformed': -1.8, 'underweight': -1.2, 'bearish': -2.0,
+    'plunge': -2.2, 'plunges': -2.2, 'plunged': -2.2, 'plummet': -2.4, 'plummets': -2.4,
+    'plummeted': -2.4, 'tumble': -1.8, 'tumbles': -1.8, 'tumbled': -1.8, 'slump': -1.8,
+    'slumps': -1.8, 'slumped': -1.8, 'sink': -1.4, 'sinks': -1.4, 'sank': -1.4,
+    'selloff': -1.8, 'sell-off': -1.8, 'misses': -1.4, 'missed': -1.4, 'layoff': -1.8,
+    'layoffs': -1.8, 'bankruptcy': -2.8, 'dilution': -1.4, 'dilutive': -1.4, 'headwind': -1.2,
+    'headwinds': -1.2, 'writedown': -1.6, 'impairment': -1.4, 'shortfall': -1.6,
+    'delisting': -2.2, 'delisted': -2.2, 'warns': -1.4, 'probe': -1.0, 'downside': -1.2,
+}
+
+# Multi-word phrases are rewritten to one synthetic token before VADER tokenizes the
+# text, so negation and intensifiers around them still apply.
+PHRASE_RULES = {
+    'beat_estimates': (2.2, ['beat estimates', 'beats estimates', 'beat expectations', 'beats expectations',
+                             'tops estimates', 'topped estimates', 'tops expectations', 'topped expectations']),
+    'missed_estimates': (-2.2, ['miss estimates', 'misses estimates', 'missed estimates', 'miss expectations',
+                                'misses expectations', 'missed expectations', 'falls short', 'fell short']),
+    'guidance_raised': (2.2, ['raises guidance', 'raised guidance', 'guidance raised', 'boosts guidance',
+                              'lifts guidance', 'raises outlook', 'raised outlook']),
+    'guidance_cut': (-2.4, ['guidance cut', 'cuts guidance', 'cut guidance', 'lowers guidance', 'lowered guidance',
+                            'guidance lowered', 'slashes guidance', 'cuts outlook', 'lowers outlook', 'profit warning']),
+    'target_raised': (1.6, ['price target raised', 'raises price target', 'raised price target',
+                            'boosts price target', 'lifts price target']),
+    'target_cut': (-1.6, ['price target cut', 'cuts price target', 'cut price target', 'lowers price target',
+                          'lowered price target', 'price target lowered']),
+    'dividend_raised': (1.6, ['dividend hike', 'dividend increase', 'raises dividend', 'hikes dividend']),
+    'dividend_cut': (-2.0, ['dividend cut', 'cuts dividend', 'suspends dividend', 'slashes dividend']),
+    'record_high': (1.8, ['all-time high', 'record high', '52-week high']),
+    'record_low': (-1.8, ['all-time low', 'record low', '52-week low']),
+    'buy_rating': (1.4, ['buy rating', 'outperform rating', 'overweight rating']),
+    'sell_rating': (-1.4, ['sell rating', 'underperform rating', 'underweight rating']),
+    'going_concern': (-2.4, ['going concern']),
+    'short_report': (-1.2, ['short seller', 'short report']),
+}
+
+# Ticker symbols ("$LOW", "NYSE: FUN") must not be read as sentiment words.
+SYMBOL_RE = re.compile(
+    r'\$[A-Za-z]{1,6}(?:\.[A-Za-z]{1,2})?\b'
+    r'|\b(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|OTC|TSX|LSE)\s*:\s*[A-Z]{1,6}(?:\.[A-Z]{1,2})?\b'
+)
+
+# ("beat", "estimates") -> "beat_estimates"; matched on whitespace tokens like VADER's own
+_PHRASE_TOKENS = {tuple(phrase.split()): token for token, (_, phrases) in PHRASE_RULES.items() for phrase in phrases}
+_PHRASE_STARTS = {words[0] for words in _PHRASE_TOKENS}
+_PHRASE_LENGTHS = sorted({len(words) for words in _PHRASE_TOKENS}, reverse=True)
+
+# Changes whenever the finance data does; stored scores are namespaced by it.
+FINANCE_DIGEST = hashlib.blake2b(repr((FINANCE_LEXICON, PHRASE_RULES, SYMBOL_RE.pattern)).encode(),
+                                 digest_size=6).hexdigest()
+
+MAGIC = b'SSLX'
+FORMAT_VERSION = 1
+# magic, version, signature, then (count, blob bytes) for the base, overlay and emoji tables
+HEADER = struct.Struct('<4sI16s6I')
+
+
+@lru_cache(maxsize=1024)
+def _symbol_re(symbol: str) -> re.Pattern:
+    return re.compile(r'(?<![\w$])' + re.escape(symbol) + r'(?!\w)')
+
+
+def mask_symbols(text: str, symbol: str = None) -> str:
+    """Drop cashtags, exchange-prefixed symbols and, when given, bare mentions of ``symbol``."""
+    if symbol:
+        text = _symbol_re(symbol).sub('', text)
+    if '$' not in text and ':' not in text:
+        return text
+    return SYMBOL_RE.sub('', text)
+
+
+def join_phrases(text: str) -> str:
+    """Rewrite known phrases in ``text`` to their single-token form; other text is unchanged."""
+    keys = [word.strip(string.punctuation) for word in text.lower().split()]
+    if _PHRASE_STARTS.isdisjoint(keys):
+        return text
+    words = text.split()
+
+    joined = []
+    i = 0
+    while i < len(words):
+        if keys[i] in _PHRASE_STARTS:
+            for n in _PHRASE_LENGTHS:
+                phrase = tuple(keys[i:i + n])
+                token = _PHRASE_TOKENS.get(phrase)
+                if token is not None:
+                    last = words[i + len(phrase) - 1]
+                    joined.append(token + last[len(last.rstrip(string.punctuation)):])
+                    i += len(phrase)
+                    break
+            else:
+                joined.append(words[i])
+                i += 1
+        else:
+            joined.append(words[i])
+            i += 1
+    return ' '.join(joined)
+
+
+def overlay() -> Dict[str, float]:
+    tokens = {token: valence for token, (valence, _) in PHRASE_RULES.items()}
+    return {**FINANCE_LEXICON, **tokens}
+
+
+def _vader_dir() -> str:
+    from vaderSentiment import vaderSentiment
+    return os.path.dirname(os.path.abspath(vaderSentiment.__file__))
+
+
+def signature() -> bytes:
+    """Identifies the inputs of a compiled file: the VADER text files and the finance data."""
+    vader_dir = _vader_dir()
+    stats = [os.stat(os.path.join(vader_dir, name)) for name in ('vader_lexicon.txt', 'emoji_utf8_lexicon.txt')]
+    inputs = (FORMAT_VERSION, FINANCE_DIGEST, tuple((st.st_size, st.st_mtime_ns) for st in stats))
+    return hashlib.blake2b(repr(inputs).encode(), digest_size=16).digest()
+
+
+def parse_vader() -> Tuple[Dict[str, float], Dict[str, str]]:
+    """VADER's lexicon and emoji table, parsed from its text files."""
+    from vaderSentiment import vaderSentiment
+    analyzer = vaderSentiment.SentimentIntensityAnalyzer()
+    return analyzer.lexicon, analyzer.emojis
+
+
+def _keys_blob(keys) -> bytes:
+    return '\n'.join(keys).encode('utf-8')
+
+
+def compile_lexicon(path: str) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]:
+    """Write the compiled file to ``path`` and return its ``(base, overlay, emojis)`` tables."""
+    base, emojis = parse_vader()
+    extra = overlay()
+    base_blob, extra_blob = _keys_blob(base), _keys_blob(extra)
+    emoji_blob = '\n'.join(f"{e}\t{d}" for e, d in emojis.items()).encode('utf-8')
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, signature(), len(base), len(base_blob),
+                                len(extra), len(extra_blob), len(emojis), len(emoji_blob)))
+            f.write(np.fromiter(base.values(), dtype='<f8', count=len(base)).tobytes())
+            f.write(np.fromiter(extra.values(), dtype='<f8', count=len(extra)).tobytes())
+            f.write(base_blob + extra_blob + emoji_blob)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Lexicon compile failed: {e}")
+    return base, extra, emojis
+
+
+def load_lexicon(path: str) -> Optional[Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]]:
+    """Read a compiled file into fresh per-process dicts; None when it is missing,
+    corrupt or built from other inputs.
+
+    The file is memory-mapped only while it is read; the returned tables are copies.
+    """
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, sig, n_base, base_len, n_extra, extra_len, n_emoji, emoji_len = HEADER.unpack_from(mm)
+            if magic != MAGIC or version != FORMAT_VERSION or sig != signature():
+                return None
+            offset = HEADER.size
+            base_values = np.frombuffer(mm, dtype='<f8', count=n_base, offset=offset).tolist()
+            offset += 8 * n_base
+            extra_values = np.frombuffer(mm, dtype='<f8', count=n_extra, offset=offset).tolist()
+            offset += 8 * n_extra
+            base_keys = mm[offset:offset + base_len].decode('utf-8').split('\n')
+            offset += base_len
+            extra_keys = mm[offset:offset + extra_len].decode('utf-8').split('\n')
+            offset += extra_len
+            emoji_lines = mm[offset:offset + emoji_len].decode('utf-8').split('\n')
+    except (OSError, ValueError, struct.error):
+        return None
+    if len(base_keys) != n_base or len(extra_keys) != n_extra or len(emoji_lines) != n_emoji:
+        return None
+    emojis = dict(line.split('\t', 1) for line in emoji_lines)
+    return dict(zip(base_keys, base_values)), dict(zip(extra_keys, extra_values)), emojis
+
+
+def get_tables(path: str = None) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, str]]:
+    """``(base, overlay, emojis)`` from the compiled file, compiling it first if it is stale."""
+    path = config.LEXICON_CACHE_PATH if path is None else path
+    if not path:
+        base, emojis = parse_vader()
+        return base, overlay(), emojis
+    return load_lexicon(path) or compile_lexicon(path)
+
+
+if __name__ == '__main__':
+    compile_lexicon(config.LEXICON_CACHE_PATH)
+    print(f"Compiled lexicon to {config.LEXICON_CACHE_PATH}")
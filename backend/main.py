@@ -1,8 +1,37 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from service import analyze_ticker
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+import config
+from cache import analysis_cache
+from history import INTERVALS, sentiment_history
+import tracing
+from http_client import close_client
+from metrics import render_prometheus, source_breaker, source_metrics
+from scheduler import prefetcher
+from screener import SORT_KEYS, screener
+from service import analyze_ticker_stream, analyze_tickers_async, warm_up
 
-app = FastAPI(title="Stock Sentiment Analyzer API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.WARMUP_ON_STARTUP:
+        # off the event loop, so the health probe answers while the lexicon loads
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+    if config.PREFETCH_ENABLED:
+        prefetcher.start()
+    if config.SCREENER_ENABLED:
+        screener.start()
+    yield
+    await screener.stop()
+    await prefetcher.stop()
+    await close_client()
+
+app = FastAPI(title="Stock Sentiment Analyzer API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -70,10 +99,39 @@ DEMO_DATA = {
     }
 }
 
+class BatchRequest(BaseModel):
+    tickers: List[str]
+
+def format_result(ticker: str, result: Dict) -> Dict:
+    return {
+        "ticker": ticker,
+        "verdict": result['verdict'],
+        "confidence_score": result['confidence_score'],
+        "stats": result['stats'],
+        "top_comments": result['top_comments'],
+        **({"sources": result['sources']} if 'sources' in result else {})
+    }
+
 @app.get("/")
 async def root():
     return {"message": "Stock Sentiment Analyzer API is running"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return analysis_cache.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    cache_counters = {k: v for k, v in analysis_cache.stats().items() if k not in ('entries', 'inflight')}
+    body = render_prometheus(source_metrics, source_breaker, [
+        ("analysis_cache_events_total", "Analysis cache lookups by result.", "event", cache_counters),
+    ])
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@app.get("/prefetch/status")
+async def prefetch_status():
+    return {"enabled": config.PREFETCH_ENABLED, **prefetcher.status()}
+
 @app.get("/demo/{ticker}")
 async def demo_analyze(ticker: str):
     ticker = ticker.upper().strip()
@@ -96,23 +154,142 @@ async def demo_analyze(ticker: str):
             ]
         }
 
+@app.get("/debug/slow")
+async def debug_slow():
+    return {"threshold_ms": config.TRACE_SLOW_MS, "traces": list(tracing.slow_traces)}
+
+def analysis_error(e: Exception, trace) -> HTTPException:
+    stage = trace.stage_of(e) if trace is not None else None
+    where = f" in {stage}" if stage else ""
+    print(f"Analysis failed{where}: {e!r}")
+    status = 504 if isinstance(e, asyncio.TimeoutError) else 500
+    headers = {"Server-Timing": trace.server_timing()} if trace is not None else None
+    return HTTPException(status_code=status, detail=f"Analysis failed{where}: {type(e).__name__}: {e}", headers=headers)
+
 @app.get("/analyze/{ticker}")
-async def analyze_stock(ticker: str):
+async def analyze_stock(ticker: str, response: Response, debug: str = None):
+    ticker = ticker.upper().strip()
+    
+    if not ticker or len(ticker) > 10:
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    
+    trace = tracing.start(f"/analyze/{ticker}", force=debug == "timing")
     try:
-        ticker = ticker.upper().strip()
-        
-        if not ticker or len(ticker) > 10:
-            raise HTTPException(status_code=400, detail="Invalid ticker symbol")
-        
-        result = analyze_ticker(ticker)
+        prefetcher.record(ticker)
+        with tracing.span("cache"):
+            result = await analysis_cache.get(ticker, ttl=config.ANALYZE_CACHE_TTL)
+    except Exception as e:
+        raise analysis_error(e, trace)
+    finally:
+        tracing.finish(trace)
+    
+    body = format_result(ticker, result)
+    if trace is not None:
+        response.headers["Server-Timing"] = trace.server_timing()
+        if debug == "timing":
+            body["timing"] = trace.to_dict()
+    return body
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchRequest):
+    tickers = list(dict.fromkeys(t.upper().strip() for t in request.tickers))
+    
+    if not tickers or len(tickers) > config.BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {config.BATCH_MAX_TICKERS} tickers")
+    if any(not t or len(t) > 10 for t in tickers):
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    
+    async def stream():
+        pending = []
+        for ticker in tickers:
+            prefetcher.record(ticker)
+            cached = analysis_cache.peek(ticker, ttl=config.ANALYZE_CACHE_TTL, serve=True)
+            if cached is None:
+                pending.append(ticker)
+            else:
+                yield json.dumps(format_result(ticker, cached)) + "\n"
         
-        return {
-            "ticker": ticker,
-            "verdict": result['verdict'],
-            "confidence_score": result['confidence_score'],
-            "stats": result['stats'],
-            "top_comments": result['top_comments']
-        }
+        async for ticker, result in analyze_tickers_async(pending):
+            if 'error' in result:
+                yield json.dumps({"ticker": ticker, "error": result['error']}) + "\n"
+                continue
+            analysis_cache.put(ticker, result)
+            yield json.dumps(format_result(ticker, result)) + "\n"
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
\ No newline at end of file
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/analyze/{ticker}/stream")
+async def analyze_stock_stream(ticker: str, format: str = "ndjson"):
+    ticker = ticker.upper().strip()
+    
+    if not ticker or len(ticker) > 10:
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    
+    prefetcher.record(ticker)
+    
+    def frame(payload: Dict) -> str:
+        if format == "sse":
+            return f"event: {payload['event']}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps(payload) + "\n"
+    
+    async def stream():
+        try:
+            async for update in analyze_ticker_stream(ticker):
+                if update['event'] == 'final':
+                    analysis_cache.put(ticker, {k: v for k, v in update.items() if k not in ('event', 'sources_done', 'sources_total')})
+                yield frame({
+                    "event": update['event'],
+                    **{k: update[k] for k in ('source', 'sources_done', 'sources_total') if k in update},
+                    **format_result(ticker, update)
+                })
+        except Exception as e:
+            yield frame({"event": "error", "ticker": ticker, "detail": f"Analysis failed: {str(e)}"})
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+def parse_timestamp(value: str, name: str) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid '{name}' timestamp: {value}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+@app.get("/history/{ticker}")
+async def history(ticker: str, from_: str = Query(None, alias="from"), to: str = None, interval: str = "hour"):
+    ticker = ticker.upper().strip()
+    
+    if not ticker or len(ticker) > 10:
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    if interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(INTERVALS)}")
+    
+    end = parse_timestamp(to, "to") if to else datetime.now(timezone.utc)
+    start = parse_timestamp(from_, "from") if from_ else end - timedelta(days=config.HISTORY_DEFAULT_DAYS)
+    
+    return {
+        "ticker": ticker,
+        "interval": interval,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "series": await asyncio.to_thread(sentiment_history.query, ticker, start.timestamp(), end.timestamp(), interval)
+    }
+
+@app.get("/screen")
+async def screen(sort: str = "confidence_score", limit: int = 20, sector: str = None, order: str = "desc"):
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    
+    return {
+        "sort": sort,
+        "order": order,
+        "sector": sector,
+        "results": await screener.screen(sort, limit, sector, descending=order == "desc"),
+        "status": screener.status()
+    }
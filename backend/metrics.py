@@ -0,0 +1,182 @@
+import time
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import config
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 10.0)
+OUTCOMES = ('success', 'empty', 'error', 'timeout', 'skipped', 'cancelled')
+# outcomes whose latency says how long the source takes to answer; a timeout is a lower bound
+RESPONSE_OUTCOMES = ('success', 'empty', 'timeout')
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            rows.append((repr(bound), total))
+        rows.append(('+Inf', self.count))
+        return rows
+
+
+class SourceMetrics:
+    """Latency histogram, outcome counts and articles yielded per news source.
+
+    The last ``window`` response latencies of each source are also kept, so recent
+    percentiles can be read without the histogram's bucket resolution.
+    """
+
+    def __init__(self, window: int = 200):
+        self.latency: Dict[str, Histogram] = defaultdict(Histogram)
+        self.outcomes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.articles: Dict[str, int] = defaultdict(int)
+        self.recent: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def observe(self, source: str, seconds: float, outcome: str, articles: int = 0) -> None:
+        # skipped calls never ran and cancelled ones were stopped by the caller
+        if outcome not in ('skipped', 'cancelled'):
+            self.latency[source].observe(seconds)
+        if outcome in RESPONSE_OUTCOMES:
+            self.recent[source].append(seconds)
+        self.outcomes[(source, outcome)] += 1
+        self.articles[source] += articles
+
+    def percentile(self, source: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """The ``q`` quantile of ``source``'s recent latencies; None with fewer than ``min_samples``."""
+        samples = self.recent.get(source)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        sources = sorted({source for source, _ in self.outcomes})
+        return {
+            source: {
+                **{outcome: self.outcomes.get((source, outcome), 0) for outcome in OUTCOMES},
+                'articles': self.articles.get(source, 0),
+                'avg_latency': round(self.latency[source].sum / self.latency[source].count, 3)
+                if self.latency[source].count else None
+            }
+            for source in sources
+        }
+
+
+class CircuitBreaker:
+    """Per-source breaker: opens after consecutive failures, half-opens after a cooldown.
+
+    While open, calls are skipped. After the cooldown a single trial call is let
+    through; success closes the breaker, failure re-opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.opened_at: Dict[str, float] = {}
+        self.trial_in_flight: Dict[str, bool] = defaultdict(bool)
+
+    def allow(self, source: str) -> bool:
+        opened_at = self.opened_at.get(source)
+        if opened_at is None:
+            return True
+        if time.monotonic() - opened_at < self.cooldown or self.trial_in_flight[source]:
+            return False
+        self.trial_in_flight[source] = True
+        return True
+
+    def record_success(self, source: str) -> None:
+        self.failures[source] = 0
+        self.opened_at.pop(source, None)
+        self.trial_in_flight[source] = False
+
+    def record_failure(self, source: str) -> None:
+        self.failures[source] += 1
+        self.trial_in_flight[source] = False
+        if source in self.opened_at or self.failures[source] >= self.failure_threshold:
+            if source not in self.opened_at:
+                print(f"Circuit opened for {source} after {self.failures[source]} failures")
+            self.opened_at[source] = time.monotonic()
+
+    def record_cancelled(self, source: str) -> None:
+        """The caller abandoned the call: no verdict on the source, but a trial slot is freed."""
+        self.trial_in_flight[source] = False
+
+    def release_trial(self, source: str) -> None:
+        """Free the trial slot once a call ends, however it ended."""
+        self.trial_in_flight[source] = False
+
+    def state(self, source: str) -> str:
+        opened_at = self.opened_at.get(source)
+        if opened_at is None:
+            return 'closed'
+        return 'open' if time.monotonic() - opened_at < self.cooldown else 'half_open'
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def render_prometheus(metrics: SourceMetrics, breaker: CircuitBreaker,
+                      counters: Iterable[Tuple[str, str, str, Dict[str, float]]] = ()) -> str:
+    """Prometheus text exposition of source metrics plus extra counters.
+
+    Each extra counter is ``(name, help, label_name, {label_value: value})``.
+    """
+    lines = [
+        "# HELP news_source_latency_seconds Time to fetch and parse one news source.",
+        "# TYPE news_source_latency_seconds histogram",
+    ]
+    for source, histogram in sorted(metrics.latency.items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f"news_source_latency_seconds_bucket{{{_labels(source=source, le=bound)}}} {count}")
+        lines.append(f"news_source_latency_seconds_sum{{{_labels(source=source)}}} {histogram.sum:.6f}")
+        lines.append(f"news_source_latency_seconds_count{{{_labels(source=source)}}} {histogram.count}")
+
+    lines += [
+        "# HELP news_source_requests_total News source calls by outcome.",
+        "# TYPE news_source_requests_total counter",
+    ]
+    for (source, outcome), count in sorted(metrics.outcomes.items()):
+        lines.append(f"news_source_requests_total{{{_labels(source=source, outcome=outcome)}}} {count}")
+
+    lines += [
+        "# HELP news_source_articles_total Articles returned per news source.",
+        "# TYPE news_source_articles_total counter",
+    ]
+    for source, count in sorted(metrics.articles.items()):
+        lines.append(f"news_source_articles_total{{{_labels(source=source)}}} {count}")
+
+    lines += [
+        "# HELP news_source_circuit_open Whether the source's circuit breaker is skipping calls.",
+        "# TYPE news_source_circuit_open gauge",
+    ]
+    for source in sorted({source for source, _ in metrics.outcomes}):
+        lines.append(f"news_source_circuit_open{{{_labels(source=source)}}} {int(breaker.state(source) == 'open')}")
+
+    for name, help_text, label, samples in counters:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key, value in samples.items():
+            lines.append(f"{name}{{{_labels(**{label: key})}}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+source_metrics = SourceMetrics(config.FANOUT_WINDOW)
+source_breaker = CircuitBreaker(config.BREAKER_FAILURES, config.BREAKER_COOLDOWN)
@@ -0,0 +1,249 @@
+"""Incremental parsers for HTML and RSS/Atom responses.
+
+Each parser is fed the response body chunk by chunk and reports when it has the
+elements it needs, so ``http_client.fetch`` can stop reading there. No tree of the
+document is built. ``FeedParser`` does keep the bytes read so far, for its
+``feedparser`` fallback, until it has all its entries.
+"""
+import codecs
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+
+ITEM_TAGS = {'item', f'{RSS1}item', f'{ATOM}entry'}
+TITLE_TAGS = {'title', f'{RSS1}title', f'{ATOM}title'}
+SUMMARY_TAGS = {'description', f'{RSS1}description', f'{ATOM}summary'}
+# feedparser falls back to the full content when an entry has no summary element
+CONTENT_TAGS = {'{http://purl.org/rss/1.0/modules/content/}encoded', f'{ATOM}content'}
+TEXT_TAGS = TITLE_TAGS | SUMMARY_TAGS | CONTENT_TAGS
+# feedparser reads dc:date and atom:updated as 'updated', not 'published'
+DATE_TAGS = {'pubDate', f'{ATOM}published'}
+
+# get_text() skips strings inside these, as BeautifulSoup does
+SKIPPED_TAGS = {'script', 'style', 'template'}
+
+
+class HeadingParser(HTMLParser):
+    """Text of the first ``limit`` ``<tag>`` elements, as ``find_all(tag, limit=limit)``
+    and ``get_text(strip=True)`` would give it.
+
+    As in BeautifulSoup, a ``<tag>`` nested in another is a result of its own, ordered
+    by its start tag, and its text is also part of the outer element's text.
+    """
+
+    def __init__(self, tag: str, limit: int, encoding: str = 'utf-8'):
+        super().__init__(convert_charrefs=True)
+        self.tag = tag
+        self.limit = limit
+        self.texts: List[str] = []
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        # [start index, strings] of every open element, innermost last
+        self._open: List[list] = []
+        self._started = 0
+        self._ignored = 0
+        self._finished: Dict[int, str] = {}
+        self._skipping = 0
+        self._pending: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.texts) >= self.limit
+
+    def feed_bytes(self, chunk: bytes) -> bool:
+        """Parse ``chunk``; True once ``limit`` elements have been read."""
+        self.feed(self._decoder.decode(chunk))
+        return self.done
+
+    def finish(self) -> List[str]:
+        if not self.done:
+            self.feed(self._decoder.decode(b'', final=True))
+            self.close()
+            self._flush()
+            while self._open:
+                self._close_innermost()
+        return self.texts[:self.limit]
+
+    # html.parser may split one text node across handle_data calls, so strings are
+    # only stripped once a tag boundary closes them, like BeautifulSoup's strings.
+    def _flush(self) -> None:
+        text = ''.join(self._pending).strip()
+        self._pending = []
+        if text:
+            for _, strings in self._open:
+                strings.append(text)
+
+    def _close_innermost(self) -> None:
+        index, strings = self._open.pop()
+        self._finished[index] = ''.join(strings)
+        # results are ordered by start tag, so an outer element waits for its nested ones
+        while len(self.texts) in self._finished:
+            self.texts.append(self._finished.pop(len(self.texts)))
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._open:
+            self._flush()
+        if tag == self.tag:
+            if self._started < self.limit:
+                self._open.append([self._started, []])
+                self._started += 1
+            elif self._open:
+                self._ignored += 1
+        elif tag in SKIPPED_TAGS and self._open:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if self.done or not self._open:
+            return
+        self._flush()
+        if tag in SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag == self.tag:
+            if self._ignored:
+                self._ignored -= 1
+            else:
+                self._close_innermost()
+
+    def handle_data(self, data):
+        if self._open and not self._skipping and not self.done:
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        if self._open:
+            self._flush()
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Naive UTC datetime from an RFC 822 or ISO 8601 date, like feedparser's ``*_parsed``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def load_sanitizer():
+    """feedparser's HTML sanitizer. The import takes tens of milliseconds, so
+    ``service.warm_up`` loads it ahead of the first feed summary with markup."""
+    from feedparser.sanitizer import _sanitize_html
+
+    return _sanitize_html
+
+
+def _sanitize(summary: str) -> str:
+    """``summary`` as feedparser returns it: scripts, styles and event handlers removed."""
+    if '<' not in summary:
+        return summary
+    return load_sanitizer()(summary, 'utf-8', 'text/html')
+
+
+class FeedParser:
+    """The first ``limit`` RSS/Atom entries as ``{'title', 'summary', 'published'}`` dicts.
+
+    Malformed XML (undefined HTML entities are common) and titles or summaries with
+    unescaped markup fall back to ``feedparser`` on the whole body, so the body is
+    buffered until ``limit`` entries have been read and released then. Summaries are
+    sanitized the way ``feedparser`` sanitizes them.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries: List[Dict] = []
+        self._pull = ET.XMLPullParser(events=('end',))
+        self._raw: Optional[bytearray] = bytearray()
+        self._broken = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.entries) >= self.limit
+
+    def feed_bytes(self, chunk: bytes) -> bool:
+        """Parse ``chunk``; True once ``limit`` entries have been read."""
+        if self.done:
+            return True
+        self._raw += chunk
+        if self._broken:
+            return False
+        try:
+            self._pull.feed(chunk)
+            self._drain()
+        except ET.ParseError:
+            self._broken = True
+        if self.done:
+            # the fallback is only needed before all entries are read
+            self._raw = None
+        return self.done
+
+    def _drain(self) -> None:
+        for _, element in self._pull.read_events():
+            if element.tag in ITEM_TAGS:
+                if any(len(child) for child in element if child.tag in TEXT_TAGS):
+                    # feedparser serializes inline markup back into the text; leave it to it
+                    self._broken = True
+                    return
+                self.entries.append(self._entry(element))
+                # finished entries are the bulk of the document; drop them from the tree
+                element.clear()
+                if self.done:
+                    return
+
+    @staticmethod
+    def _entry(element: ET.Element) -> Dict:
+        entry = {'title': '', 'summary': '', 'published': None}
+        has_summary, content = False, None
+        for child in element:
+            text = (child.text or '').strip()
+            if child.tag in TITLE_TAGS:
+                entry['title'] = text
+            elif child.tag in SUMMARY_TAGS:
+                has_summary = True
+                if not entry['summary']:
+                    entry['summary'] = _sanitize(text)
+            elif child.tag in CONTENT_TAGS and content is None:
+                content = text
+            elif child.tag in DATE_TAGS and entry['published'] is None:
+                entry['published'] = _parse_date(text)
+        # even an empty summary element wins over the content, wherever it appears
+        if not has_summary and content is not None:
+            entry['summary'] = _sanitize(content)
+        return entry
+
+    def finish(self) -> List[Dict]:
+        if not self._broken and not self.done:
+            try:
+                self._pull.close()
+                self._drain()
+            except ET.ParseError:
+                self._broken = True
+        if self._broken:
+            return self._fallback()
+        self._raw = None
+        return self.entries[:self.limit]
+
+    def _fallback(self) -> List[Dict]:
+        import feedparser
+
+        raw, self._raw = bytes(self._raw), None
+        entries = []
+        for entry in feedparser.parse(raw).entries[:self.limit]:
+            published = entry.get('published_parsed', None)
+            entries.append({
+                'title': entry.get('title', ''),
+                'summary': entry.get('summary', ''),
+                'published': datetime(*published[:6]) if published else None,
+            })
+        return entries
@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import config
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SharedBuckets:
+    """Token buckets kept in SQLite so every worker process draws from the same budget."""
+
+    def __init__(self, path: str, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets (source TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def take(self, source: str) -> float:
+        """Consume one token for ``source``; returns 0, or the seconds to wait before retrying."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE source = ?", (source,)
+                ).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+                if not wait:
+                    tokens -= 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (source, tokens, updated) VALUES (?, ?, ?)",
+                    (source, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def acquire(self, source: str) -> None:
+        while True:
+            # take() can wait on another worker's write lock; keep that off the event loop
+            wait = await asyncio.to_thread(self.take, source)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class SourceRateLimiter:
+    """Token bucket per upstream source, shared by every request in the process.
+
+    With ``shared_path`` the buckets live in SQLite and are shared by every worker
+    process on the host instead.
+    """
+
+    def __init__(self, rate: float, burst: float, shared_path: Optional[str] = None):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._shared = SharedBuckets(shared_path, rate, burst) if shared_path and rate > 0 else None
+
+    async def acquire(self, source: str) -> None:
+        if self.rate <= 0:
+            return
+        if self._shared is not None:
+            await self._shared.acquire(source)
+            return
+        bucket = self._buckets.get(source)
+        if bucket is None:
+            bucket = self._buckets[source] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+
+source_limiter = SourceRateLimiter(config.SOURCE_RATE_LIMIT, config.SOURCE_RATE_BURST, config.RATE_LIMIT_DB_PATH)
@@ -0,0 +1,112 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+# Query parameters that change between runs (date windows) and must not affect fixture keys.
+VOLATILE_PARAMS = {"from", "to"}
+KEPT_HEADERS = {"content-type", "etag", "last-modified"}
+
+
+def fixture_key(request: httpx.Request) -> str:
+    params = sorted((k, v) for k, v in request.url.params.multi_items() if k not in VOLATILE_PARAMS)
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{request.url.host}{request.url.path}?{query}"
+
+
+def fixture_path(fixture_dir: str, key: str) -> str:
+    host = key.split("/", 1)[0]
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(fixture_dir, f"{host}__{digest}.json")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through to ``inner`` and save every response as a JSON fixture."""
+
+    def __init__(self, fixture_dir: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.fixture_dir = fixture_dir
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        key = fixture_key(request)
+        fixture = {
+            "key": key,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "body": base64.b64encode(body).decode(),
+        }
+        with open(fixture_path(self.fixture_dir, key), "w") as f:
+            json.dump(fixture, f, indent=1)
+        return httpx.Response(response.status_code, headers=fixture["headers"], content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve recorded fixtures with injected latency and failures; never touches the network.
+
+    A request without an exact fixture falls back to a fixture recorded for the same
+    host, so any ticker can be replayed from a small fixture set. ``host_latency``
+    adds a per-host delay on top of ``latency`` to simulate slow sources, and
+    ``failure_rate`` turns that share of requests into connection errors or 503s.
+    """
+
+    def __init__(self, fixture_dir: str, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 host_latency: Dict[str, float] = None, seed: int = 0, fallback: bool = True):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.host_latency = host_latency or {}
+        self.fallback = fallback
+        self.rng = random.Random(seed)
+        self.fixtures: Dict[str, Dict] = {}
+        self.by_host: Dict[str, List[Dict]] = defaultdict(list)
+        for name in sorted(os.listdir(fixture_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(fixture_dir, name)) as f:
+                    fixture = json.load(f)
+                fixture["content"] = base64.b64decode(fixture["body"])
+                self.fixtures[fixture["key"]] = fixture
+                self.by_host[fixture["key"].split("/", 1)[0]].append(fixture)
+
+    def _lookup(self, request: httpx.Request) -> Optional[Dict]:
+        key = fixture_key(request)
+        fixture = self.fixtures.get(key)
+        if fixture is None and self.fallback:
+            candidates = self.by_host.get(request.url.host)
+            if candidates:
+                fixture = candidates[int(hashlib.sha1(key.encode()).hexdigest(), 16) % len(candidates)]
+        return fixture
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency + self.rng.random() * self.jitter + self.host_latency.get(request.url.host, 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            if self.rng.random() < 0.5:
+                raise httpx.ConnectError("injected failure", request=request)
+            return httpx.Response(503, request=request)
+        fixture = self._lookup(request)
+        if fixture is None:
+            return httpx.Response(404, request=request)
+        return httpx.Response(fixture["status"], headers=fixture["headers"], content=fixture["content"], request=request)
+
+
+def transport_from_config(mode: str, fixture_dir: str, latency: float = 0.0,
+                          failure_rate: float = 0.0) -> Optional[httpx.AsyncBaseTransport]:
+    if mode == "record":
+        return RecordingTransport(fixture_dir)
+    if mode == "replay":
+        return ReplayTransport(fixture_dir, latency=latency, failure_rate=failure_rate)
+    return None
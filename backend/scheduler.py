@@ -0,0 +1,138 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, Optional, Sequence
+
+import config
+from cache import ResultCache, analysis_cache
+from ratelimit import SourceRateLimiter, source_limiter
+from service import NEWS_SOURCE_NAMES
+
+# every source one analysis calls: the quote lookup plus the news fan-out
+PREFETCH_SOURCES = ['Yahoo Quote', *NEWS_SOURCE_NAMES]
+
+
+class PrefetchScheduler:
+    """Keeps the most requested tickers warm in ``cache``.
+
+    Request counts decay every cycle so the hot set follows current interest. Each
+    cycle refreshes the top-N tickers whose entries would expire before the next
+    cycle, at most ``concurrency`` at a time. Nobody waits on a refresh, so it is
+    throttled like batch traffic: before refreshing a ticker the cycle takes one
+    ``limiter`` token for each of ``sources``.
+    """
+
+    def __init__(self, cache: ResultCache, top_n: int, interval: float, jitter: float = 0.1,
+                 concurrency: int = 4, decay: float = 0.5, limiter: Optional[SourceRateLimiter] = None,
+                 sources: Sequence[str] = PREFETCH_SOURCES):
+        self.cache = cache
+        self.top_n = top_n
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.decay = decay
+        self.limiter = limiter
+        self.sources = list(sources)
+        self.requests: Counter = Counter()
+        self.cycles = 0
+        self.last_cycle_seconds = 0.0
+        self.last_cycle_lag = 0.0
+        self.last_refreshed: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, ticker: str) -> None:
+        self.requests[ticker] += 1
+
+    def hot_tickers(self) -> list:
+        return [ticker for ticker, _ in self.requests.most_common(self.top_n)]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            due = time.time() + delay
+            await asyncio.sleep(delay)
+            self.last_cycle_lag = max(0.0, time.time() - due)
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                print(f"Prefetch cycle error: {e}")
+
+    async def run_cycle(self) -> None:
+        started = time.time()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        due = [t for t in self.hot_tickers() if self._needs_refresh(t)]
+
+        async def refresh(ticker: str) -> None:
+            async with semaphore:
+                # spread refreshes so hot tickers do not hit every source at the same instant
+                await asyncio.sleep(random.uniform(0, self.jitter * self.interval / max(len(due), 1)))
+                if self.limiter is not None:
+                    # the refresh runs through cache.refresh, outside any batch budget
+                    for source in self.sources:
+                        await self.limiter.acquire(source)
+                try:
+                    await self.cache.refresh(ticker)
+                    self.last_refreshed[ticker] = time.time()
+                except Exception as e:
+                    print(f"Prefetch {ticker} failed: {e}")
+
+        await asyncio.gather(*(refresh(t) for t in due))
+
+        for ticker in list(self.requests):
+            self.requests[ticker] *= self.decay
+            if self.requests[ticker] < 0.01:
+                del self.requests[ticker]
+        self.cycles += 1
+        self.last_cycle_seconds = time.time() - started
+
+    def _needs_refresh(self, ticker: str) -> bool:
+        age = self.cache.age(ticker)
+        return age is None or age + self.interval * (1 + self.jitter) >= self.cache.ttl
+
+    def status(self) -> Dict:
+        now = time.time()
+        warming = []
+        for ticker in self.hot_tickers():
+            age = self.cache.age(ticker)
+            refreshed = self.last_refreshed.get(ticker)
+            warming.append({
+                'ticker': ticker,
+                'requests': round(self.requests[ticker], 2),
+                'cache_age': None if age is None else round(age, 1),
+                'behind': None if age is None else round(max(0.0, age - self.cache.ttl), 1),
+                'last_refreshed_ago': None if refreshed is None else round(now - refreshed, 1)
+            })
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'interval': self.interval,
+            'top_n': self.top_n,
+            'cycles': self.cycles,
+            'last_cycle_seconds': round(self.last_cycle_seconds, 3),
+            'last_cycle_lag': round(self.last_cycle_lag, 3),
+            'warming': warming
+        }
+
+
+prefetcher = PrefetchScheduler(
+    analysis_cache,
+    top_n=config.PREFETCH_TOP_N,
+    interval=config.PREFETCH_INTERVAL,
+    jitter=config.PREFETCH_JITTER,
+    concurrency=config.PREFETCH_CONCURRENCY,
+    decay=config.PREFETCH_DECAY,
+    limiter=source_limiter,
+)
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+import config
+import lexicon
+
+URL_RE = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+
+# Built on first use; loading the lexicon is the costliest part of boot.
+_engine = None
+_engine_lock = threading.Lock()
+
+# text digest -> compound score, bounded LRU; scoring also runs in worker threads
+_memo: "OrderedDict[bytes, float]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def clean_text(text: str) -> str:
+    text = URL_RE.sub('', text)
+    text = SPECIAL_CHARS_RE.sub('', text)
+    return text.strip()
+
+
+class VaderEngine:
+    """VADER with its general-purpose lexicon, as shipped."""
+
+    # prefix for persisted scores, so scores from different engines never mix
+    namespace = ''
+
+    def __init__(self, lexicon_table: Dict[str, float], emojis: Dict[str, str]):
+        from vaderSentiment import vaderSentiment
+
+        # skip __init__, which re-reads and parses the text lexicons
+        self.analyzer = vaderSentiment.SentimentIntensityAnalyzer.__new__(vaderSentiment.SentimentIntensityAnalyzer)
+        self.analyzer.lexicon = lexicon_table
+        self.analyzer.emojis = emojis
+        self._vader = vaderSentiment
+        # clean_text strips almost every emoji; texts without the survivors skip VADER's per-character emoji pass
+        survivors = [e for e in emojis if len(e) == 1 and not SPECIAL_CHARS_RE.match(e)]
+        self._emoji_re = re.compile('[' + ''.join(map(re.escape, survivors)) + ']') if survivors else None
+
+    @classmethod
+    def from_tables(cls, base: Dict[str, float], overlay: Dict[str, float], emojis: Dict[str, str]) -> "VaderEngine":
+        return cls(base, emojis)
+
+    def compound(self, text: str) -> float:
+        """``analyzer.polarity_scores(text)['compound']`` for cleaned text, computing only the compound."""
+        if self._emoji_re is not None and self._emoji_re.search(text):
+            return self.analyzer.polarity_scores(text)['compound']
+
+        vader, analyzer = self._vader, self.analyzer
+        lexicon_table, boosters = analyzer.lexicon, vader.BOOSTER_DICT
+        sentitext = vader.SentiText(text)
+        words = sentitext.words_and_emoticons
+        sentiments = []
+        for i, item in enumerate(words):
+            lowered = item.lower()
+            # words outside the lexicon always score 0 in sentiment_valence
+            if lowered not in lexicon_table or lowered in boosters or (
+                    lowered == "kind" and i < len(words) - 1 and words[i + 1].lower() == "of"):
+                sentiments.append(0)
+                continue
+            sentiments = analyzer.sentiment_valence(0, sentitext, item, i, sentiments)
+        sentiments = analyzer._but_check(words, sentiments)
+
+        if not sentiments:
+            return 0.0
+        sum_s = float(sum(sentiments))
+        emphasis = analyzer._punctuation_emphasis(text)
+        if sum_s > 0:
+            sum_s += emphasis
+        elif sum_s < 0:
+            sum_s -= emphasis
+        return round(vader.normalize(sum_s), 4)
+
+    def masked_symbol(self, ticker: Optional[str]) -> Optional[str]:
+        """The symbol ``score`` masks for ``ticker``; scores depend on it, so it is part of every cache key."""
+        return None
+
+    def score(self, text: str, symbol: Optional[str] = None) -> float:
+        cleaned = clean_text(text)
+        if not cleaned:
+            return 0.0
+        return self.compound(cleaned)
+
+
+class FinanceEngine(VaderEngine):
+    """VADER with the finance lexicon merged in, ticker symbols masked and phrase rules applied."""
+
+    namespace = f'finance:{lexicon.FINANCE_DIGEST}:'
+
+    @classmethod
+    def from_tables(cls, base: Dict[str, float], overlay: Dict[str, float], emojis: Dict[str, str]) -> "FinanceEngine":
+        return cls({**base, **overlay}, emojis)
+
+    def masked_symbol(self, ticker: Optional[str]) -> Optional[str]:
+        # only tickers that read as words ("LOW", "FUN") change scores when masked
+        if ticker and ticker.lower() in self.analyzer.lexicon:
+            return ticker
+        return None
+
+    def score(self, text: str, symbol: Optional[str] = None) -> float:
+        text = lexicon.mask_symbols(URL_RE.sub('', text), symbol)
+        cleaned = SPECIAL_CHARS_RE.sub('', text).strip()
+        if not cleaned:
+            return 0.0
+        return self.compound(lexicon.join_phrases(cleaned))
+
+
+ENGINES = {'vader': VaderEngine, 'finance': FinanceEngine}
+
+
+def engine_class() -> type:
+    if config.SCORING_ENGINE not in ENGINES:
+        raise ValueError(f"Unknown SCORING_ENGINE {config.SCORING_ENGINE!r}; expected one of {', '.join(ENGINES)}")
+    return ENGINES[config.SCORING_ENGINE]
+
+
+def get_engine() -> VaderEngine:
+    """The configured scoring engine, built from the compiled lexicon on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = engine_class().from_tables(*lexicon.get_tables())
+    return _engine
+
+
+def score_namespace(ticker: Optional[str] = None) -> str:
+    """Key prefix for persisted scores of ``ticker``'s articles under the configured engine."""
+    symbol = get_engine().masked_symbol(ticker)
+    return engine_class().namespace + (f'{symbol}:' if symbol else '')
+
+
+def _score_uncached(text: str, symbol: Optional[str] = None) -> float:
+    return get_engine().score(text, symbol)
+
+
+def _score_chunk(texts: List[str], symbol: Optional[str] = None) -> List[float]:
+    return [_score_uncached(text, symbol) for text in texts]
+
+
+def _digest(text: str, symbol: Optional[str] = None) -> bytes:
+    if symbol:
+        text = f'{symbol}\x00{text}'
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _recall(digest: bytes) -> Optional[float]:
+    with _memo_lock:
+        score = _memo.get(digest)
+        if score is not None:
+            _memo.move_to_end(digest)
+    return score
+
+
+def _remember(digest: bytes, score: float) -> None:
+    with _memo_lock:
+        _memo[digest] = score
+        if len(_memo) > config.SCORE_MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def score_text(text: str, ticker: Optional[str] = None) -> float:
+    symbol = get_engine().masked_symbol(ticker)
+    digest = _digest(text, symbol)
+    score = _recall(digest)
+    if score is None:
+        score = _score_uncached(text, symbol)
+        _remember(digest, score)
+    return score
+
+
+def score_texts(texts: Sequence[str], processes: Optional[int] = None, ticker: Optional[str] = None) -> np.ndarray:
+    """Compound scores for ``texts``, identical to scoring each text on its own.
+
+    Repeated texts, within the call or seen by earlier calls, are scored once. With
+    ``processes`` set, large batches of unseen texts are split across a process pool.
+    ``ticker`` names the stock the texts are about, so its symbol is not read as a word.
+    """
+    symbol = get_engine().masked_symbol(ticker)
+    digests = [_digest(text, symbol) for text in texts]
+    scores = np.empty(len(texts), dtype=np.float64)
+
+    pending = {}
+    for i, digest in enumerate(digests):
+        score = _recall(digest)
+        if score is None:
+            pending.setdefault(digest, texts[i])
+        else:
+            scores[i] = score
+
+    if pending:
+        unseen = list(pending.values())
+        if processes and len(unseen) >= config.SCORE_POOL_MIN_TEXTS:
+            workers = processes if processes > 0 else os.cpu_count() or 1
+            size = -(-len(unseen) // (workers * 4))
+            chunks = [unseen[i:i + size] for i in range(0, len(unseen), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fresh = [score for chunk in pool.map(partial(_score_chunk, symbol=symbol), chunks) for score in chunk]
+        else:
+            fresh = _score_chunk(unseen, symbol)
+        for digest, score in zip(pending, fresh):
+            _remember(digest, score)
+            pending[digest] = score
+        for i, digest in enumerate(digests):
+            if digest in pending:
+                scores[i] = pending[digest]
+
+    return scores
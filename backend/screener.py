@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import time
+from typing import Dict, List, Optional, Tuple
+
+import config
+from cache import ResultCache, analysis_cache
+from service import analyze_tickers_async
+
+SORT_KEYS = ('confidence_score', 'momentum', 'volatility', 'consensus_strength')
+
+
+def load_universe(path: str) -> Dict[str, Optional[str]]:
+    """Read ``SYMBOL[,Sector]`` lines; blank lines and ``#`` comments are skipped."""
+    universe = {}
+    if not path:
+        return universe
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                symbol, _, sector = line.partition(',')
+                universe[symbol.strip().upper()] = sector.strip() or None
+    return universe
+
+
+class RankingIndex:
+    """Sorted ``(value, ticker)`` list with O(log n) lookup and in-place updates."""
+
+    def __init__(self):
+        self.entries: List[Tuple[float, str]] = []
+        self.values: Dict[str, float] = {}
+
+    def update(self, ticker: str, value: float) -> None:
+        self.remove(ticker)
+        bisect.insort(self.entries, (value, ticker))
+        self.values[ticker] = value
+
+    def remove(self, ticker: str) -> None:
+        old = self.values.pop(ticker, None)
+        if old is not None:
+            del self.entries[bisect.bisect_left(self.entries, (old, ticker))]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class Screener:
+    """Ranks every analyzed ticker on the screening metrics.
+
+    Indexes are updated whenever ``cache`` stores a fresh analysis, whether it came
+    from a user request, the prefetcher or the periodic universe sweep, so queries
+    only walk the pre-sorted indexes.
+    """
+
+    def __init__(self, cache: ResultCache, universe: Dict[str, Optional[str]], interval: float, chunk_size: int):
+        self.cache = cache
+        self.universe = universe
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.indexes = {key: RankingIndex() for key in SORT_KEYS}
+        self.rows: Dict[str, Dict] = {}
+        self.sweeps = 0
+        self.last_sweep_seconds = 0.0
+        self.last_sweep_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        cache.subscribe(self.update)
+
+    def update(self, ticker: str, result: Dict) -> None:
+        stats = result.get('advanced_stats') or {}
+        if 'momentum' not in stats:
+            self.remove(ticker)
+            return
+        row = {
+            'ticker': ticker,
+            'verdict': result['verdict'],
+            'confidence_score': result['confidence_score'],
+            'momentum': stats['momentum'],
+            'volatility': stats['volatility'],
+            'consensus_strength': stats['consensus_strength'],
+            'sector': self.universe.get(ticker) or result.get('stock_info', {}).get('sector', 'Unknown'),
+            'updated_at': time.time()
+        }
+        self.rows[ticker] = row
+        for key, index in self.indexes.items():
+            index.update(ticker, row[key])
+
+    def remove(self, ticker: str) -> None:
+        self.rows.pop(ticker, None)
+        for index in self.indexes.values():
+            index.remove(ticker)
+
+    async def screen(self, sort: str, limit: int = 20, sector: Optional[str] = None, descending: bool = True) -> List[Dict]:
+        await self.cache.sync()
+        entries = self.indexes[sort].entries
+        ordered = reversed(entries) if descending else iter(entries)
+        sector = sector.lower() if sector else None
+        results = []
+        for _, ticker in ordered:
+            row = self.rows[ticker]
+            if sector is None or row['sector'].lower() == sector:
+                results.append(row)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Screener sweep error: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> None:
+        """Score the whole universe in batches, skipping tickers with a fresh cached result.
+
+        With a shared cache backend only one worker sweeps per interval; the others
+        pick its results up through ``cache.sync``.
+        """
+        if self.cache.backend is not None and not await asyncio.to_thread(
+                self.cache.backend.acquire_lease, 'screener:sweep', self.interval):
+            return
+        started = time.time()
+        await self.cache.sync()
+        stale = [t for t in self.universe if self.cache.peek(t) is None]
+        for i in range(0, len(stale), self.chunk_size):
+            async for ticker, result in analyze_tickers_async(stale[i:i + self.chunk_size]):
+                if 'error' not in result:
+                    self.cache.put(ticker, result)
+        self.sweeps += 1
+        self.last_sweep_at = time.time()
+        self.last_sweep_seconds = self.last_sweep_at - started
+
+    def status(self) -> Dict:
+        return {
+            'universe': len(self.universe),
+            'ranked': len(self.rows),
+            'sweeps': self.sweeps,
+            'last_sweep_seconds': round(self.last_sweep_seconds, 1),
+            'last_sweep_ago': None if self.last_sweep_at is None else round(time.time() - self.last_sweep_at, 1)
+        }
+
+
+screener = Screener(
+    analysis_cache,
+    load_universe(config.SCREENER_UNIVERSE_FILE),
+    interval=config.SCREENER_INTERVAL,
+    chunk_size=config.SCREENER_CHUNK_SIZE,
+)
@@ -0,0 +1,44 @@
+"""Run the API with one worker process per available core.
+
+Workers share results, load leases and per-source rate limits through SQLite, so
+a ticker is fetched once per host no matter which worker receives the request::
+
+    python serve.py --port 8000
+    WORKERS=4 python serve.py
+"""
+import argparse
+import os
+
+import uvicorn
+
+import config
+import lexicon
+
+SHARED_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared.db")
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=config.WORKERS or available_cores())
+    args = parser.parse_args()
+
+    # workers are fresh interpreters that read config from the environment
+    os.environ.setdefault("CACHE_DB_PATH", config.CACHE_DB_PATH or SHARED_DB)
+    os.environ.setdefault("RATE_LIMIT_DB_PATH", os.environ["CACHE_DB_PATH"])
+    # compile once here so every worker just memory-maps the file
+    lexicon.get_tables()
+    print(f"Starting {args.workers} workers sharing {os.environ['CACHE_DB_PATH']}")
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
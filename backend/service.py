@@ -1,383 +1,446 @@
-import re
-import math
-from typing import Dict, List
-import requests
-from bs4 import BeautifulSoup
-import feedparser
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import contextlib
+from typing import AsyncIterator, Dict, List, Tuple
 from datetime import datetime, timedelta
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-analyzer = SentimentIntensityAnalyzer()
+import asyncio
+import time
+import config
+from http_client import fetch, run_sync
+from aggregation import IncrementalAggregator, build_analysis, calculate_weighted_score, get_verdict
+from fanout import FanOutPolicy, SourceCancelled, SourceDeadlines, fan_out
+from history import sentiment_history
+from metrics import source_breaker, source_metrics
+from parsing import FeedParser, HeadingParser, load_sanitizer
+from ratelimit import source_limiter
+from scoring import clean_text, get_engine, score_namespace, score_text, score_texts
+from store import article_store
+from tracing import span
 
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
 ]
 
-def clean_text(text: str) -> str:
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    return text.strip()
+def _parse_alpha_vantage(body: bytes) -> List[Dict]:
+    data = json.loads(body)
+    articles = []
+    if 'feed' in data:
+        for item in data['feed'][:15]:
+            time_str = item.get('time_published', '')
+            try:
+                pub_date = datetime.strptime(time_str, '%Y%m%dT%H%M%S') if time_str else datetime.now()
+            except:
+                pub_date = datetime.now()
+            articles.append({
+                'title': item.get('title', ''),
+                'summary': item.get('summary', ''),
+                'source': 'Alpha Vantage',
+                'published': pub_date
+            })
+    return articles
 
-def get_alpha_vantage_news(ticker: str) -> List[Dict]:
-    try:
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&apikey=demo"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            articles = []
-            if 'feed' in data:
-                for item in data['feed'][:15]:
-                    time_str = item.get('time_published', '')
-                    try:
-                        pub_date = datetime.strptime(time_str, '%Y%m%dT%H%M%S') if time_str else datetime.now()
-                    except:
-                        pub_date = datetime.now()
-                    articles.append({
-                        'title': item.get('title', ''),
-                        'summary': item.get('summary', ''),
-                        'source': 'Alpha Vantage',
-                        'published': pub_date
-                    })
-            return articles
-    except Exception as e:
-        print(f"Alpha Vantage error: {e}")
+async def get_alpha_vantage_news_async(ticker: str) -> List[Dict]:
+    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&apikey=demo"
+    return list(await fetch('Alpha Vantage', url, _parse_alpha_vantage) or [])
+
+def _yahoo_news_parser(encoding: str = None) -> HeadingParser:
+    return HeadingParser('h3', 15, encoding or 'utf-8')
+
+async def get_yahoo_scrape_news_async(ticker: str) -> List[Dict]:
+    url = f"https://finance.yahoo.com/quote/{ticker}/news"
+    headers = {'User-Agent': USER_AGENTS[0]}
+    titles = await fetch('Yahoo Finance', url, _yahoo_news_parser, headers, stream=True) or []
+    return [{
+        'title': title,
+        'summary': '',
+        'source': 'Yahoo Finance',
+        'published': datetime.now()
+    } for title in titles if title and len(title) > 10]
+
+FEED_LIMITS = {'Google News': 15, 'Bing News': 10, 'Seeking Alpha': 10}
+
+async def _fetch_feed(source: str, url: str) -> List[Dict]:
+    def parser(encoding: str = None) -> FeedParser:
+        return FeedParser(FEED_LIMITS[source])
+    
+    entries = await fetch(source, url, parser, {'User-Agent': USER_AGENTS[0]}, stream=True) or []
+    return [{
+        'title': entry['title'],
+        'summary': entry['summary'],
+        'source': source,
+        'published': entry['published'] or datetime.now()
+    } for entry in entries]
+
+async def get_google_news_rss_async(ticker: str, company_name: str = None) -> List[Dict]:
+    query = company_name if company_name else ticker
+    url = f"https://news.google.com/rss/search?q={query}+stock&hl=en-US&gl=US&ceid=US:en"
+    return await _fetch_feed('Google News', url)
+
+async def get_bing_news_async(ticker: str, company_name: str = None) -> List[Dict]:
+    query = company_name if company_name else ticker
+    url = f"https://www.bing.com/news/search?q={query}+stock&format=rss"
+    return await _fetch_feed('Bing News', url)
+
+async def get_seeking_alpha_rss_async(ticker: str) -> List[Dict]:
+    url = f"https://seekingalpha.com/api/sa/combined/{ticker}.xml"
+    return await _fetch_feed('Seeking Alpha', url)
+
+def _parse_finnhub(body: bytes) -> List[Dict]:
+    articles = json.loads(body)
+    if isinstance(articles, list):
+        return [{
+            'title': a.get('headline', ''),
+            'summary': a.get('summary', ''),
+            'source': 'Finnhub',
+            'published': datetime.fromtimestamp(a.get('datetime', datetime.now().timestamp()))
+        } for a in articles[:10] if a.get('headline')]
     return []
 
-def get_yahoo_scrape_news(ticker: str) -> List[Dict]:
+async def get_finnhub_news_async(ticker: str) -> List[Dict]:
+    from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    to_date = datetime.now().strftime('%Y-%m-%d')
+    
+    url = f"https://finnhub.io/api/v1/company-news?symbol={ticker}&from={from_date}&to={to_date}&token=demo"
+    return list(await fetch('Finnhub', url, _parse_finnhub) or [])
+
+def _parse_marketaux(body: bytes) -> List[Dict]:
+    data = json.loads(body)
+    articles = data.get('data', [])
+    result = []
+    for a in articles:
+        if a.get('title'):
+            pub_str = a.get('published_at', '')
+            try:
+                pub_date = datetime.fromisoformat(pub_str.replace('Z', '+00:00')) if pub_str else datetime.now()
+            except:
+                pub_date = datetime.now()
+            result.append({
+                'title': a.get('title', ''),
+                'summary': a.get('description', ''),
+                'source': 'Marketaux',
+                'published': pub_date
+            })
+    return result
+
+async def get_marketaux_news_async(ticker: str) -> List[Dict]:
+    url = f"https://api.marketaux.com/v1/news/all?symbols={ticker}&filter_entities=true&language=en&limit=10"
+    return list(await fetch('Marketaux', url, _parse_marketaux) or [])
+
+def _quote_to_info(info: Dict, ticker: str) -> Dict:
+    return {
+        'name': info.get('longName', info.get('shortName', ticker)),
+        'sector': info.get('sector', 'Unknown'),
+        'current_price': info.get('regularMarketPrice', 0)
+    }
+
+def _parse_quotes(body: bytes) -> Dict[str, Dict]:
+    data = json.loads(body)
+    infos = {}
+    if 'quoteResponse' in data and 'result' in data['quoteResponse']:
+        for info in data['quoteResponse']['result'] or []:
+            symbol = info.get('symbol', '').upper()
+            if symbol:
+                infos[symbol] = _quote_to_info(info, symbol)
+    return infos
+
+async def _get_quote_chunk(tickers: List[str], throttle: bool = False) -> Dict[str, Dict]:
     try:
-        url = f"https://finance.yahoo.com/quote/{ticker}/news"
+        if throttle:
+            await source_limiter.acquire('Yahoo Quote')
+        url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={','.join(tickers)}"
         headers = {'User-Agent': USER_AGENTS[0]}
-        response = requests.get(url, headers=headers, timeout=5)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            articles = []
-            
-            news_items = soup.find_all('h3', limit=15)
-            for item in news_items:
-                title = item.get_text(strip=True)
-                if title and len(title) > 10:
-                    articles.append({
-                        'title': title,
-                        'summary': '',
-                        'source': 'Yahoo Finance',
-                        'published': datetime.now()
-                    })
-            
-            return articles
+        return dict(await call_source('Yahoo Quote', fetch('Yahoo Quote', url, _parse_quotes, headers)) or {})
     except Exception as e:
-        print(f"Yahoo scrape error: {e}")
-    return []
+        print(f"Stock info error: {e}")
+    return {}
 
-def get_google_news_rss(ticker: str, company_name: str = None) -> List[Dict]:
+async def get_stock_infos_async(tickers: List[str], throttle: bool = False) -> Dict[str, Dict]:
+    """Quotes for ``tickers`` in batched calls; ``throttle`` applies the per-source rate limit."""
+    chunks = [tickers[i:i + config.QUOTE_BATCH_SIZE] for i in range(0, len(tickers), config.QUOTE_BATCH_SIZE)]
+    infos = {}
+    for chunk_infos in await asyncio.gather(*(_get_quote_chunk(chunk, throttle) for chunk in chunks)):
+        infos.update(chunk_infos)
+    return {t: infos.get(t, {'name': t, 'sector': 'Unknown', 'current_price': 0}) for t in tickers}
+
+async def get_stock_info_async(ticker: str) -> Dict:
+    return (await get_stock_infos_async([ticker]))[ticker]
+
+def _run_fetcher(source_name: str, coro) -> List[Dict]:
     try:
-        query = company_name if company_name else ticker
-        url = f"https://news.google.com/rss/search?q={query}+stock&hl=en-US&gl=US&ceid=US:en"
-        feed = feedparser.parse(url)
-        articles = []
-        
-        for entry in feed.entries[:15]:
-            published = entry.get('published_parsed', None)
-            pub_date = datetime(*published[:6]) if published else datetime.now()
-            articles.append({
-                'title': entry.title,
-                'summary': entry.get('summary', ''),
-                'source': 'Google News',
-                'published': pub_date
-            })
-        return articles
+        return run_sync(coro)
     except Exception as e:
-        print(f"Google News error: {e}")
+        print(f"{source_name} error: {e}")
     return []
 
+def get_alpha_vantage_news(ticker: str) -> List[Dict]:
+    return _run_fetcher('Alpha Vantage', get_alpha_vantage_news_async(ticker))
+
+def get_yahoo_scrape_news(ticker: str) -> List[Dict]:
+    return _run_fetcher('Yahoo Finance', get_yahoo_scrape_news_async(ticker))
+
+def get_google_news_rss(ticker: str, company_name: str = None) -> List[Dict]:
+    return _run_fetcher('Google News', get_google_news_rss_async(ticker, company_name))
+
 def get_bing_news(ticker: str, company_name: str = None) -> List[Dict]:
-    try:
-        query = company_name if company_name else ticker
-        url = f"https://www.bing.com/news/search?q={query}+stock&format=rss"
-        feed = feedparser.parse(url)
-        articles = []
-        
-        for entry in feed.entries[:10]:
-            published = entry.get('published_parsed', None)
-            pub_date = datetime(*published[:6]) if published else datetime.now()
-            articles.append({
-                'title': entry.title,
-                'summary': entry.get('description', ''),
-                'source': 'Bing News',
-                'published': pub_date
-            })
-        return articles
-    except Exception as e:
-        print(f"Bing News error: {e}")
-    return []
+    return _run_fetcher('Bing News', get_bing_news_async(ticker, company_name))
 
 def get_seeking_alpha_rss(ticker: str) -> List[Dict]:
-    try:
-        url = f"https://seekingalpha.com/api/sa/combined/{ticker}.xml"
-        feed = feedparser.parse(url)
-        articles = []
-        
-        for entry in feed.entries[:10]:
-            published = entry.get('published_parsed', None)
-            pub_date = datetime(*published[:6]) if published else datetime.now()
-            articles.append({
-                'title': entry.title,
-                'summary': entry.get('summary', ''),
-                'source': 'Seeking Alpha',
-                'published': pub_date
-            })
-        return articles
-    except Exception as e:
-        print(f"Seeking Alpha error: {e}")
-    return []
+    return _run_fetcher('Seeking Alpha', get_seeking_alpha_rss_async(ticker))
 
 def get_finnhub_news(ticker: str) -> List[Dict]:
-    try:
-        from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        to_date = datetime.now().strftime('%Y-%m-%d')
-        
-        url = f"https://finnhub.io/api/v1/company-news?symbol={ticker}&from={from_date}&to={to_date}&token=demo"
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            articles = response.json()
-            if isinstance(articles, list):
-                return [{
-                    'title': a.get('headline', ''),
-                    'summary': a.get('summary', ''),
-                    'source': 'Finnhub',
-                    'published': datetime.fromtimestamp(a.get('datetime', datetime.now().timestamp()))
-                } for a in articles[:10] if a.get('headline')]
-    except Exception as e:
-        print(f"Finnhub error: {e}")
-    return []
+    return _run_fetcher('Finnhub', get_finnhub_news_async(ticker))
 
 def get_marketaux_news(ticker: str) -> List[Dict]:
-    try:
-        url = f"https://api.marketaux.com/v1/news/all?symbols={ticker}&filter_entities=true&language=en&limit=10"
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            articles = data.get('data', [])
-            result = []
-            for a in articles:
-                if a.get('title'):
-                    pub_str = a.get('published_at', '')
-                    try:
-                        pub_date = datetime.fromisoformat(pub_str.replace('Z', '+00:00')) if pub_str else datetime.now()
-                    except:
-                        pub_date = datetime.now()
-                    result.append({
-                        'title': a.get('title', ''),
-                        'summary': a.get('description', ''),
-                        'source': 'Marketaux',
-                        'published': pub_date
-                    })
-            return result
-    except Exception as e:
-        print(f"Marketaux error: {e}")
-    return []
+    return _run_fetcher('Marketaux', get_marketaux_news_async(ticker))
 
 def get_stock_info(ticker: str) -> Dict:
+    return run_sync(get_stock_info_async(ticker))
+
+def analyze_sentiment(text: str, ticker: str = None) -> float:
+    return score_text(text, ticker)
+
+def warm_up() -> None:
+    """Load the scoring engine and the feed summary sanitizer ahead of the first request."""
+    get_engine()
+    load_sanitizer()
+
+SOURCE_TIMEOUT = 6
+
+# per-source timeouts learned from recent latencies, never above SOURCE_TIMEOUT
+source_deadlines = SourceDeadlines(source_metrics, SOURCE_TIMEOUT)
+
+# A single-ticker analysis has a caller waiting on it. Batches queue their sources on a
+# shared budget, where a deadline would cut sources that never got to run.
+REQUEST_POLICY = FanOutPolicy.from_config()
+BATCH_POLICY = FanOutPolicy()
+
+class SourceSkipped(Exception):
+    pass
+
+async def call_source(source_name: str, coro, timeout: float = None):
+    """Await one upstream call with its circuit breaker, timeout and metrics."""
+    if timeout is None:
+        timeout = source_deadlines.timeout(source_name)
+    if not source_breaker.allow(source_name):
+        coro.close()
+        source_metrics.observe(source_name, 0.0, 'skipped')
+        raise SourceSkipped(f"{source_name} circuit open")
+    
+    started = time.perf_counter()
     try:
-        url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={ticker}"
-        headers = {'User-Agent': USER_AGENTS[0]}
-        response = requests.get(url, headers=headers, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'quoteResponse' in data and 'result' in data['quoteResponse']:
-                result = data['quoteResponse']['result']
-                if result:
-                    info = result[0]
-                    return {
-                        'name': info.get('longName', info.get('shortName', ticker)),
-                        'sector': info.get('sector', 'Unknown'),
-                        'current_price': info.get('regularMarketPrice', 0)
-                    }
+        with span(f'source.{source_name}'):
+            result = await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        source_metrics.observe(source_name, time.perf_counter() - started, 'timeout')
+        source_breaker.record_failure(source_name)
+        raise
+    except asyncio.CancelledError:
+        # the fan-out stopped waiting; not the source's failure
+        source_metrics.observe(source_name, time.perf_counter() - started, 'cancelled')
+        source_breaker.record_cancelled(source_name)
+        raise
+    except Exception:
+        source_metrics.observe(source_name, time.perf_counter() - started, 'error')
+        source_breaker.record_failure(source_name)
+        raise
+    else:
+        # fetch() returns None for a 204 or a 304 with nothing cached: an empty answer
+        count = len(result) if result else 0
+        source_metrics.observe(source_name, time.perf_counter() - started, 'success' if count else 'empty', count)
+        source_breaker.record_success(source_name)
+    finally:
+        # a half-open breaker lets one trial through; never leave it waiting on this one
+        source_breaker.release_trial(source_name)
+    return result
+
+async def _fetch_source(source_name: str, coro, budget: asyncio.Semaphore = None) -> tuple:
+    """Fetch one source. Batch traffic (sharing a ``budget``) is also rate limited per
+    source; a single-ticker analysis has a caller waiting and is not throttled."""
+    called = False
+    try:
+        async with budget or contextlib.nullcontext():
+            if budget is not None:
+                await source_limiter.acquire(source_name)
+            called = True
+            return source_name, await call_source(source_name, coro), None
     except Exception as e:
-        print(f"Stock info error: {e}")
+        return source_name, [], e
+    except asyncio.CancelledError:
+        # cancelled while still queued; call_source records its own cancellations
+        if not called:
+            source_metrics.observe(source_name, 0.0, 'cancelled')
+        raise
+    finally:
+        # a no-op once the call ran; otherwise the fetch coroutine was never awaited
+        coro.close()
+
+NEWS_SOURCE_NAMES = ['Google News', 'Bing News', 'Yahoo Finance', 'Finnhub', 'Marketaux', 'Seeking Alpha', 'Alpha Vantage']
+
+def get_news_sources(ticker: str, company_name: str) -> List[tuple]:
+    return [
+        ('Google News', get_google_news_rss_async(ticker, company_name)),
+        ('Bing News', get_bing_news_async(ticker, company_name)),
+        ('Yahoo Finance', get_yahoo_scrape_news_async(ticker)),
+        ('Finnhub', get_finnhub_news_async(ticker)),
+        ('Marketaux', get_marketaux_news_async(ticker)),
+        ('Seeking Alpha', get_seeking_alpha_rss_async(ticker)),
+        ('Alpha Vantage', get_alpha_vantage_news_async(ticker))
+    ]
+
+def _scorer(ticker: str):
+    def score(texts: List[str]):
+        with span('score'):
+            return score_texts(texts, ticker=ticker)
+    return score
+
+async def query_articles(ticker: str, seen_since: float = None) -> List[Dict]:
+    """Stored articles for ``ticker``, scored by the configured engine."""
+    return await asyncio.to_thread(article_store.query, ticker, _scorer(ticker), score_namespace(ticker), seen_since)
+
+async def ingest_articles(ticker: str, articles: List[Dict]) -> List[Dict]:
+    """Store unseen articles and append them to the sentiment history.
+
+    SQLite writes can wait on the database lock, so they run in a worker thread
+    rather than on the event loop.
+    """
+    with span('ingest'):
+        new_articles = await asyncio.to_thread(article_store.ingest, ticker, articles, _scorer(ticker),
+                                               score_namespace(ticker))
+        await asyncio.to_thread(sentiment_history.append, ticker, new_articles)
+    return new_articles
+
+def source_outcome(error: Exception = None) -> str:
+    if error is None:
+        return 'included'
+    if isinstance(error, SourceCancelled):
+        return error.reason
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout'
+    if isinstance(error, SourceSkipped):
+        return 'skipped'
+    return 'error'
+
+def source_report(outcomes: Dict[str, str]) -> Dict:
+    """Which sources a result includes, and why the others are missing."""
+    return {
+        'included': [name for name in NEWS_SOURCE_NAMES if outcomes.get(name) == 'included'],
+        'excluded': {name: outcomes[name] for name in NEWS_SOURCE_NAMES if outcomes.get(name, 'included') != 'included'}
+    }
+
+async def iter_sources(ticker: str, company_name: str, budget: asyncio.Semaphore = None,
+                       policy: FanOutPolicy = REQUEST_POLICY, started: float = None) -> AsyncIterator[tuple]:
+    """Yield ``(source_name, articles, error)`` for each news source as it completes.
+
+    ``policy`` decides when to stop waiting (counted from loop time ``started``); sources
+    still running then are cancelled and yielded with a ``SourceCancelled`` error.
+    """
+    calls = [(name, _fetch_source(name, coro, budget)) for name, coro in get_news_sources(ticker, company_name)]
     
-    return {'name': ticker, 'sector': 'Unknown', 'current_price': 0}
-
-def analyze_sentiment(text: str) -> float:
-    cleaned = clean_text(text)
-    if not cleaned:
-        return 0.0
-    sentiment = analyzer.polarity_scores(cleaned)
-    return sentiment['compound']
-
-def calculate_weighted_score(compound: float, recency_days: int = 0) -> float:
-    recency_weight = max(1, 7 - recency_days)
-    return compound * math.log(recency_weight + 1)
-
-def get_verdict(final_metric: float) -> str:
-    if final_metric > 0.2:
-        return "STRONG BUY"
-    elif final_metric > 0.05:
-        return "BUY"
-    elif final_metric < -0.2:
-        return "STRONG SELL"
-    elif final_metric < -0.05:
-        return "SELL"
-    else:
-        return "HOLD"
+    async for source_name, articles, error in fan_out(calls, policy, started):
+        if error is None:
+            print(f"{source_name}: {len(articles)} articles")
+        elif isinstance(error, SourceCancelled):
+            print(f"{source_name} cancelled ({error.reason})")
+        else:
+            print(f"{source_name} failed: {error!r}")
+        yield source_name, articles, error
 
-def analyze_ticker(ticker: str) -> Dict:
+async def analyze_ticker_async(ticker: str, stock_info: Dict = None, budget: asyncio.Semaphore = None,
+                               policy: FanOutPolicy = REQUEST_POLICY) -> Dict:
     ticker = ticker.upper()
+    started = asyncio.get_running_loop().time()
     
-    stock_info = get_stock_info(ticker)
+    if stock_info is None:
+        with span('stock_info'):
+            stock_info = await get_stock_info_async(ticker)
     company_name = stock_info['name']
     
-    all_articles = []
-    
     print(f"Fetching news for {ticker}...")
     
+    fetch_started = time.time()
     all_articles = []
-    news_sources = [
-        ('Google News', lambda: get_google_news_rss(ticker, company_name)),
-        ('Bing News', lambda: get_bing_news(ticker, company_name)),
-        ('Yahoo Finance', lambda: get_yahoo_scrape_news(ticker)),
-        ('Finnhub', lambda: get_finnhub_news(ticker)),
-        ('Marketaux', lambda: get_marketaux_news(ticker)),
-        ('Seeking Alpha', lambda: get_seeking_alpha_rss(ticker)),
-        ('Alpha Vantage', lambda: get_alpha_vantage_news(ticker))
-    ]
-    
-    with ThreadPoolExecutor(max_workers=7) as executor:
-        future_to_source = {executor.submit(func): name for name, func in news_sources}
-        
-        for future in as_completed(future_to_source):
-            source_name = future_to_source[future]
-            try:
-                articles = future.result(timeout=6)
-                print(f"{source_name}: {len(articles)} articles")
-                all_articles.extend(articles)
-            except Exception as e:
-                print(f"{source_name} failed: {e}")
+    outcomes = {}
+    with span('fetch'):
+        async for source_name, articles, error in iter_sources(ticker, company_name, budget, policy, started):
+            all_articles.extend(articles)
+            outcomes[source_name] = source_outcome(error)
     
     print(f"Total articles collected: {len(all_articles)}")
+    new_articles = await ingest_articles(ticker, all_articles)
+    print(f"New articles stored: {len(new_articles)}")
     
-    if not all_articles:
-        return {
-            'verdict': 'INSUFFICIENT DATA',
-            'confidence_score': 0.0,
-            'stats': {'bullish': 0, 'bearish': 0, 'neutral': 0},
-            'top_comments': [],
-            'stock_info': stock_info
-        }
+    with span('query'):
+        stored = await query_articles(ticker, fetch_started)
+    with span('aggregate'):
+        return {**build_analysis(stored, stock_info), 'sources': source_report(outcomes)}
+
+async def analyze_ticker_stream(ticker: str) -> AsyncIterator[Dict]:
+    """Yield a provisional analysis after each source lands, then the final result.
+
+    Provisional frames come from an incremental aggregator seeded with the stored
+    articles, so the first frame arrives as soon as the fastest source completes.
+    The final frame is identical to ``analyze_ticker_async``.
+    """
+    ticker = ticker.upper()
+    started = asyncio.get_running_loop().time()
+    stock_info = await get_stock_info_async(ticker)
+    sources_total = len(NEWS_SOURCE_NAMES)
     
-    analyzed_data = []
-    for article in all_articles:
-        text = f"{article['title']} {article['summary']}"
-        compound = analyze_sentiment(text)
-        
-        if abs(compound) < 0.02:
-            continue
-        
-        pub_date = article.get('published', datetime.now())
-        hours_old = (datetime.now() - pub_date).total_seconds() / 3600
-        days_old = hours_old / 24
-        
-        recency_days = min(int(days_old), 7)
-        weighted_score = calculate_weighted_score(compound, recency_days)
-        
-        analyzed_data.append({
-            'text': article['title'][:200],
-            'compound': compound,
-            'weighted_score': weighted_score,
-            'source': article['source'],
-            'sentiment_type': 'bullish' if compound > 0.05 else 'bearish' if compound < -0.05 else 'neutral',
-            'published': pub_date,
-            'hours_old': hours_old,
-            'days_old': days_old
-        })
+    fetch_started = time.time()
+    aggregator = IncrementalAggregator(stock_info)
+    aggregator.add(await query_articles(ticker))
     
-    if not analyzed_data:
-        return {
-            'verdict': 'INSUFFICIENT DATA',
-            'confidence_score': 0.0,
-            'stats': {'bullish': 0, 'bearish': 0, 'neutral': 0},
-            'top_comments': [],
-            'stock_info': stock_info,
-            'advanced_stats': {}
+    sources_done = 0
+    outcomes = {}
+    async for source_name, articles, error in iter_sources(ticker, stock_info['name'], started=started):
+        sources_done += 1
+        outcomes[source_name] = source_outcome(error)
+        aggregator.add(await ingest_articles(ticker, articles))
+        yield {
+            'event': 'partial',
+            'source': source_name,
+            'source_articles': len(articles),
+            'source_error': None if error is None else repr(error),
+            'sources_done': sources_done,
+            'sources_total': sources_total,
+            **aggregator.snapshot()
         }
     
-    final_metric = sum(item['weighted_score'] for item in analyzed_data) / len(analyzed_data)
-    verdict = get_verdict(final_metric)
-    
-    bullish_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'bullish')
-    bearish_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'bearish')
-    neutral_count = sum(1 for item in analyzed_data if item['sentiment_type'] == 'neutral')
-    
-    sentiments = [item['compound'] for item in analyzed_data]
-    avg_sentiment = sum(sentiments) / len(sentiments)
-    variance = sum((x - avg_sentiment) ** 2 for x in sentiments) / len(sentiments)
-    std_dev = math.sqrt(variance)
-    
-    recent_24h = [item for item in analyzed_data if item['hours_old'] <= 24]
-    recent_7d = [item for item in analyzed_data if item['days_old'] <= 7]
-    
-    sentiment_24h = sum(item['compound'] for item in recent_24h) / len(recent_24h) if recent_24h else 0
-    sentiment_7d = sum(item['compound'] for item in recent_7d) / len(recent_7d) if recent_7d else 0
-    
-    sorted_by_time = sorted(analyzed_data, key=lambda x: x['hours_old'])
-    if len(sorted_by_time) >= 3:
-        recent_avg = sum(item['compound'] for item in sorted_by_time[:3]) / 3
-        older_avg = sum(item['compound'] for item in sorted_by_time[-3:]) / 3
-        momentum = recent_avg - older_avg
-    else:
-        momentum = 0
-    
-    sorted_articles = sorted(analyzed_data, key=lambda x: abs(x['weighted_score']), reverse=True)[:15]
-    
-    top_comments = []
-    for item in sorted_articles:
-        hours = item['hours_old']
-        if hours < 1:
-            time_ago = f"{int(hours * 60)}m ago"
-        elif hours < 24:
-            time_ago = f"{int(hours)}h ago"
-        else:
-            time_ago = f"{int(item['days_old'])}d ago"
-        
-        top_comments.append({
-            'text': item['text'],
-            'score': round(item['compound'], 3),
-            'sentiment': item['sentiment_type'],
-            'source': item['source'],
-            'time_ago': time_ago,
-            'hours_old': round(hours, 1)
-        })
-    
-    confidence_score = min(abs(final_metric) * 100, 100)
-    
-    advanced_stats = {
-        'avg_sentiment': round(avg_sentiment, 4),
-        'volatility': round(std_dev, 4),
-        'momentum': round(momentum, 4),
-        'sentiment_24h': round(sentiment_24h, 4),
-        'sentiment_7d': round(sentiment_7d, 4),
-        'articles_24h': len(recent_24h),
-        'articles_7d': len(recent_7d),
-        'bullish_ratio': round(bullish_count / len(analyzed_data), 3),
-        'bearish_ratio': round(bearish_count / len(analyzed_data), 3),
-        'consensus_strength': round(max(bullish_count, bearish_count) / len(analyzed_data), 3)
+    stored = await query_articles(ticker, fetch_started)
+    yield {
+        'event': 'final',
+        'sources_done': sources_done,
+        'sources_total': sources_total,
+        **build_analysis(stored, stock_info),
+        'sources': source_report(outcomes)
     }
+
+def analyze_ticker(ticker: str) -> Dict:
+    return run_sync(analyze_ticker_async(ticker))
+
+async def analyze_tickers_async(tickers: List[str]) -> AsyncIterator[Tuple[str, Dict]]:
+    """Analyze a watchlist, yielding ``(ticker, result)`` as each ticker finishes.
+
+    Quotes are fetched in batched calls and every ticker's source fan-out shares one
+    concurrency budget, so wall-clock time grows sublinearly with the list size.
+    """
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t.strip()))
+    if not tickers:
+        return
+    stock_infos = await get_stock_infos_async(tickers, throttle=True)
+    budget = asyncio.Semaphore(config.BATCH_CONCURRENCY)
     
-    return {
-        'verdict': verdict,
-        'confidence_score': round(confidence_score, 2),
-        'stats': {
-            'bullish': bullish_count,
-            'bearish': bearish_count,
-            'neutral': neutral_count
-        },
-        'top_comments': top_comments,
-        'stock_info': stock_info,
-        'advanced_stats': advanced_stats
-    }
\ No newline at end of file
+    async def run(ticker: str) -> Tuple[str, Dict]:
+        try:
+            return ticker, await analyze_ticker_async(ticker, stock_infos[ticker], budget, BATCH_POLICY)
+        except Exception as e:
+            print(f"{ticker} analysis failed: {e}")
+            return ticker, {'error': str(e)}
+    
+    for next_done in asyncio.as_completed([run(t) for t in tickers]):
+        yield await next_done
+
+def analyze_tickers(tickers: List[str]) -> Dict[str, Dict]:
+    async def collect() -> Dict[str, Dict]:
+        return {ticker: result async for ticker, result in analyze_tickers_async(tickers)}
+    return run_sync(collect())
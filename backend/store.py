@@ -0,0 +1,158 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+
+import config
+
+_SUFFIX_RE = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published REAL NOT NULL,
+    -- the score when first stored; reads take the current engine's score from scores
+    compound REAL NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (ticker, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_ticker_published ON articles (ticker, published);
+CREATE INDEX IF NOT EXISTS idx_articles_ticker_last_seen ON articles (ticker, last_seen);
+CREATE TABLE IF NOT EXISTS scores (
+    content_hash TEXT PRIMARY KEY,
+    compound REAL NOT NULL
+);
+"""
+
+
+def title_fingerprint(title: str) -> str:
+    """Collapse near-duplicate headlines: drop a trailing " - Publisher" and punctuation."""
+    normalized = _SUFFIX_RE.sub('', title.strip()).lower()
+    normalized = _NON_ALNUM_RE.sub(' ', normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def content_hash(title: str, summary: str) -> str:
+    return hashlib.sha1(f"{title}\x00{summary}".encode()).hexdigest()
+
+
+def _to_timestamp(published) -> float:
+    if not isinstance(published, datetime):
+        return time.time()
+    if published.tzinfo is not None:
+        published = published.astimezone().replace(tzinfo=None)
+    return published.timestamp()
+
+
+class ArticleStore:
+    """SQLite store of unique articles per ticker, each scored exactly once."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def ingest(self, ticker: str, articles: List[Dict], score_texts: Callable[[List[str]], Sequence[float]],
+               score_namespace: str = '') -> List[Dict]:
+        """Insert unseen articles for ``ticker`` and return the newly stored rows.
+
+        Articles without a stored score are scored in one ``score_texts`` call. Stored
+        scores are keyed by ``score_namespace`` so each scoring engine keeps its own.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            pending = {}
+            for article in articles:
+                fingerprint = title_fingerprint(article['title'])
+                if fingerprint in pending:
+                    continue
+                updated = self._conn.execute(
+                    "UPDATE articles SET last_seen = ? WHERE ticker = ? AND fingerprint = ?",
+                    (now, ticker, fingerprint),
+                ).rowcount
+                if not updated:
+                    pending[fingerprint] = (article, content_hash(article['title'], article['summary']))
+
+            known = {}
+            for _, digest in pending.values():
+                row = self._conn.execute(
+                    "SELECT compound FROM scores WHERE content_hash = ?", (score_namespace + digest,)
+                ).fetchone()
+                if row is not None:
+                    known[digest] = row[0]
+            unscored = {digest: article for article, digest in pending.values() if digest not in known}
+            if unscored:
+                texts = [f"{a['title']} {a['summary']}" for a in unscored.values()]
+                fresh = dict(zip(unscored, (float(score) for score in score_texts(texts))))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO scores (content_hash, compound) VALUES (?, ?)",
+                    ((score_namespace + digest, score) for digest, score in fresh.items()),
+                )
+                known.update(fresh)
+
+            new_rows = []
+            for fingerprint, (article, digest) in pending.items():
+                published = _to_timestamp(article.get('published'))
+                compound = known[digest]
+                self._conn.execute(
+                    "INSERT INTO articles (ticker, fingerprint, content_hash, title, summary, source, published,"
+                    " compound, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ticker, fingerprint, digest, article['title'], article['summary'], article['source'],
+                     published, compound, now, now),
+                )
+                new_rows.append(self._row_to_article(article['title'], article['summary'], article['source'], published, compound))
+        return new_rows
+
+    def query(self, ticker: str, score_texts: Callable[[List[str]], Sequence[float]], score_namespace: str = '',
+              seen_since: float = None) -> List[Dict]:
+        """Articles for ``ticker`` published within the lookback window or seen since ``seen_since``.
+
+        Compounds are ``score_namespace``'s scores, so after an engine or lexicon change
+        no article is served with the old engine's score: articles without a score in
+        the namespace are rescored in one ``score_texts`` call first.
+        """
+        published_since = time.time() - config.ARTICLE_LOOKBACK_DAYS * 86400
+        seen_since = published_since if seen_since is None else seen_since
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT a.title, a.summary, a.source, a.published, a.content_hash, s.compound FROM articles a"
+                " LEFT JOIN scores s ON s.content_hash = ? || a.content_hash"
+                " WHERE a.ticker = ? AND (a.published >= ? OR a.last_seen >= ?) ORDER BY a.id",
+                (score_namespace, ticker, published_since, seen_since),
+            ).fetchall()
+            unscored = {digest: f"{title} {summary}" for title, summary, _, _, digest, compound in rows if compound is None}
+            fresh = {}
+            if unscored:
+                fresh = dict(zip(unscored, (float(score) for score in score_texts(list(unscored.values())))))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO scores (content_hash, compound) VALUES (?, ?)",
+                    ((score_namespace + digest, score) for digest, score in fresh.items()),
+                )
+        return [self._row_to_article(title, summary, source, published, fresh[digest] if compound is None else compound)
+                for title, summary, source, published, digest, compound in rows]
+
+    @staticmethod
+    def _row_to_article(title: str, summary: str, source: str, published: float, compound: float) -> Dict:
+        return {
+            'title': title,
+            'summary': summary,
+            'source': source,
+            'published': datetime.fromtimestamp(published),
+            'compound': compound
+        }
+
+
+article_store = ArticleStore(config.ARTICLE_DB_PATH)
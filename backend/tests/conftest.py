@@ -0,0 +1,9 @@
+import os
+import sys
+
+# config is read at import time: keep every store in memory and every request offline
+os.environ.setdefault("ARTICLE_DB_PATH", ":memory:")
+os.environ.setdefault("CACHE_DB_PATH", "")
+os.environ.setdefault("HTTP_MODE", "replay")
+os.environ.setdefault("WARMUP_ON_STARTUP", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
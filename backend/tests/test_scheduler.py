@@ -0,0 +1,22 @@
+import asyncio
+
+from cache import ResultCache
+from ratelimit import SourceRateLimiter
+from scheduler import PREFETCH_SOURCES, PrefetchScheduler
+
+
+async def _load(ticker: str) -> dict:
+    return {'ticker': ticker}
+
+
+def test_prefetch_takes_a_token_per_source_for_each_refresh():
+    limiter = SourceRateLimiter(rate=0.001, burst=5)
+    prefetcher = PrefetchScheduler(ResultCache(_load, ttl=60), top_n=2, interval=1, jitter=0, limiter=limiter)
+    prefetcher.record('AAA')
+    prefetcher.record('BBB')
+
+    asyncio.run(prefetcher.run_cycle())
+
+    assert set(limiter._buckets) == set(PREFETCH_SOURCES)
+    for bucket in limiter._buckets.values():
+        assert round(bucket.tokens) == 3
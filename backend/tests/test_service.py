@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+import httpx
+
+import http_client
+import service
+from metrics import source_breaker, source_metrics
+
+
+def test_call_source_treats_a_204_as_an_empty_answer_and_frees_the_trial():
+    source = 'Yahoo Quote'
+    # half-open: the cooldown has passed, so the next call is the single trial
+    source_breaker.opened_at[source] = time.monotonic() - source_breaker.cooldown - 1
+    previous = http_client._transport
+    http_client.set_transport(httpx.MockTransport(lambda request: httpx.Response(204)))
+
+    async def run():
+        try:
+            return await service.call_source(source, http_client.fetch(source, 'https://quote.test/v7', len))
+        finally:
+            await http_client.close_client()
+
+    try:
+        assert asyncio.run(run()) is None
+    finally:
+        http_client.set_transport(previous)
+    assert not source_breaker.trial_in_flight[source]
+    assert source_breaker.state(source) == 'closed'
+    assert source_metrics.outcomes[(source, 'empty')] == 1
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+import config
+import scoring
+from store import ArticleStore
+
+ARTICLES = [{'title': 'Apple beats estimates and raises guidance', 'summary': '', 'source': 'Test',
+             'published': datetime.now()}]
+
+
+def _use_engine(monkeypatch, name: str):
+    monkeypatch.setattr(config, 'SCORING_ENGINE', name)
+    monkeypatch.setattr(scoring, '_engine', None)
+    # the memo is per process and keyed by text; an engine switch means a restart
+    scoring._memo.clear()
+
+    def score(texts):
+        return scoring.score_texts(texts, ticker='AAPL')
+    return score, scoring.score_namespace('AAPL')
+
+
+@pytest.fixture(autouse=True)
+def restore_engine():
+    yield
+    scoring._engine = None
+    scoring._memo.clear()
+
+
+def test_query_rescores_articles_stored_under_another_engine(monkeypatch):
+    store = ArticleStore(':memory:')
+    vader, vader_namespace = _use_engine(monkeypatch, 'vader')
+    store.ingest('AAPL', ARTICLES, vader, vader_namespace)
+    [old] = store.query('AAPL', vader, vader_namespace)
+
+    finance, finance_namespace = _use_engine(monkeypatch, 'finance')
+    expected = float(finance([f"{ARTICLES[0]['title']} {ARTICLES[0]['summary']}"])[0])
+    store.ingest('AAPL', ARTICLES, finance, finance_namespace)
+    [new] = store.query('AAPL', finance, finance_namespace)
+
+    assert expected != old['compound']
+    assert new['compound'] == expected
+    # switching back serves the stored vader score again, without rescoring
+    monkeypatch.setattr(config, 'SCORING_ENGINE', 'vader')
+    [again] = store.query('AAPL', lambda texts: pytest.fail('rescored'), vader_namespace)
+    assert again['compound'] == old['compound']
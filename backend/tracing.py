@@ -0,0 +1,203 @@
+"""Per-request stage timing and slow-request capture.
+
+A ``Trace`` is bound to the current request through a context variable, so it follows
+the request into the tasks it starts (the cache loader, the source fan-out). Code marks
+its stages with ``span(name)``; without an active trace that is a shared no-op context,
+so untraced requests pay one context-variable lookup per stage.
+
+Traces finishing above ``TRACE_SLOW_MS`` are logged and kept for ``/debug/slow``. With
+``TRACE_PROFILE`` on, the event loop thread is sampled while traced requests run and
+slow ones keep the sampled stacks. The loop is shared, so samples can include other
+requests in flight at the same time.
+"""
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import config
+
+_current: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar('trace', default=None)
+_NOOP = nullcontext()
+_TOKEN_RE = re.compile(r'[^a-z0-9_.-]+')
+
+# most recent slow traces, newest last
+slow_traces: deque = deque(maxlen=config.TRACE_SLOW_KEEP)
+
+
+class Span:
+    __slots__ = ('trace', 'name', 'start', 'duration', 'error')
+
+    def __init__(self, trace: "Trace", name: str):
+        self.trace = trace
+        self.name = name
+        self.duration = None
+        self.error = None
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+            # the innermost span sees an exception first; outer spans it passes through keep that stage
+            if exc is not self.trace.error:
+                self.trace.error = exc
+                self.trace.failed_stage = self.name
+        self.trace.spans.append(self)
+
+
+class Trace:
+    """Spans recorded for one request, in the order they finished."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.spans: List[Span] = []
+        self.error: Optional[BaseException] = None
+        self.failed_stage: Optional[str] = None
+        self.profile: Optional[Counter] = None
+        self._token = None
+
+    def span(self, name: str) -> Span:
+        return Span(self, name)
+
+    def stage_of(self, error: BaseException) -> Optional[str]:
+        """The innermost stage ``error`` was raised in, if it was raised inside a span."""
+        return self.failed_stage if error is self.error else None
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per span name; repeated stages are summed."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value: one metric per stage plus ``total``."""
+        metrics = []
+        for name, seconds in self.totals().items():
+            token = _TOKEN_RE.sub('_', name.lower())
+            desc = f';desc="{name}"' if token != name else ''
+            metrics.append(f'{token}{desc};dur={seconds * 1000:.1f}')
+        total = self.duration if self.duration is not None else time.perf_counter() - self.start
+        metrics.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def to_dict(self) -> Dict:
+        payload = {
+            'name': self.name,
+            'started_at': self.started_at,
+            'total_ms': round((self.duration or 0.0) * 1000, 1),
+            'spans': [{
+                'name': span.name,
+                'offset_ms': round((span.start - self.start) * 1000, 1),
+                'duration_ms': round(span.duration * 1000, 1),
+                **({'error': span.error} if span.error else {}),
+            } for span in sorted(self.spans, key=lambda span: span.start)],
+        }
+        if self.profile:
+            # collapsed stacks, as read by flamegraph.pl and speedscope
+            payload['profile'] = [f'{stack} {count}' for stack, count in self.profile.most_common(config.TRACE_PROFILE_STACKS)]
+        return payload
+
+
+def span(name: str):
+    """Time ``name`` as a stage of the current request's trace, if there is one."""
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return Span(trace, name)
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+def start(name: str, force: bool = False) -> Optional[Trace]:
+    """Begin tracing the current request when tracing is enabled or ``force`` is set."""
+    if not (config.TRACE_ENABLED or force):
+        return None
+    trace = Trace(name)
+    trace._token = _current.set(trace)
+    if config.TRACE_PROFILE:
+        sampler.subscribe(trace)
+    return trace
+
+
+def finish(trace: Optional[Trace]) -> None:
+    """Close ``trace``; slow ones are logged and kept with their sampled profile."""
+    if trace is None:
+        return
+    trace.duration = time.perf_counter() - trace.start
+    _current.reset(trace._token)
+    profile = sampler.unsubscribe(trace) if config.TRACE_PROFILE else None
+    if trace.duration * 1000 >= config.TRACE_SLOW_MS:
+        trace.profile = profile
+        slow_traces.append(trace.to_dict())
+        stages = ', '.join(f'{name}={seconds * 1000:.0f}ms' for name, seconds in trace.totals().items())
+        print(f"Slow request {trace.name}: {trace.duration * 1000:.0f}ms ({stages})")
+
+
+class Sampler:
+    """Samples the stacks of threads running traced requests while any are active.
+
+    One daemon thread serves every subscribed trace; it exits when the last trace
+    unsubscribes, so nothing runs between traced requests.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._profiles: Dict[Trace, tuple] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, trace: Trace) -> None:
+        with self._lock:
+            self._profiles[trace] = (threading.get_ident(), Counter())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='trace-sampler', daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, trace: Trace) -> Counter:
+        with self._lock:
+            _, profile = self._profiles.pop(trace, (None, Counter()))
+        return profile
+
+    def _run(self) -> None:
+        while True:
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                stacks = {}
+                for thread_id, profile in self._profiles.values():
+                    if thread_id not in frames:
+                        continue
+                    if thread_id not in stacks:
+                        stacks[thread_id] = _collapse(frames[thread_id])
+                    profile[stacks[thread_id]] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+sampler = Sampler(config.TRACE_PROFILE_INTERVAL)